@@ -3,10 +3,64 @@ import streamlit as st
 import json
 import os
 import re
+import mmap
 import time
+import tempfile
 from datetime import datetime
+from functools import lru_cache
 from openai import OpenAI
 
+_PROFILE_MARKER_RE = re.compile(r'(\[PROFILE:.*?\])')
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+def _loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _write_json_atomic(filename, obj):
+    """Write to a unique temp file beside filename, then swap it in so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filename) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_dumps(obj))
+        os.replace(tmp_path, filename)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _read_json(filename):
+    with open(filename, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if orjson and size > 65536:
+            # Parse large user data files straight from the mapping
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    return orjson.loads(view)
+                finally:
+                    view.release()
+        return _loads(f.read())
+
+@lru_cache(maxsize=256)
+def format_feedback_date(iso_value):
+    return datetime.fromisoformat(iso_value).strftime('%B %d, %Y at %I:%M %p')
+
+def _dumps(obj):
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
 class BetaReader:
     def __init__(self, openai_client):
         self.client = openai_client
@@ -16,14 +70,14 @@ class BetaReader:
         if session_id not in responses_state:
             return ""
         
-        session_text = ""
+        parts = []
         session_data = responses_state[session_id]
         
         if "questions" in session_data:
             for question, answer_data in session_data["questions"].items():
-                session_text += f"Q: {question}\nA: {answer_data['answer']}\n\n"
+                parts.append(f"Q: {question}\nA: {answer_data['answer']}\n\n")
         
-        return session_text
+        return "".join(parts)
     
     def generate_feedback(self, session_title, session_text, feedback_type="comprehensive", profile_sections=None):
         """Generate beta reader/editor feedback for a completed session"""
@@ -117,8 +171,7 @@ Focus on:
         try:
             filename = get_user_filename_func(user_id)
             if os.path.exists(filename):
-                with open(filename, 'r') as f:
-                    user_data = json.load(f)
+                user_data = _read_json(filename)
             else:
                 user_data = {"responses": {}, "vignettes": [], "beta_feedback": {}}
             
@@ -127,8 +180,7 @@ Focus on:
             
             user_data["beta_feedback"][str(session_id)] = feedback_data
             
-            with open(filename, 'w') as f:
-                json.dump(user_data, f, indent=2)
+            _write_json_atomic(filename, user_data)
             
             return True
         except Exception as e:
@@ -140,8 +192,15 @@ Focus on:
         try:
             filename = get_user_filename_func(user_id)
             if os.path.exists(filename):
-                with open(filename, 'r') as f:
-                    user_data = json.load(f)
+                if ijson:
+                    # Only walk beta_feedback; responses and vignettes are skipped unparsed
+                    with open(filename, 'rb') as f:
+                        for sid, feedback in ijson.kvitems(f, 'beta_feedback', use_float=True):
+                            if sid == str(session_id):
+                                return feedback
+                    return None
+                
+                user_data = _read_json(filename)
                 
                 if "beta_feedback" in user_data and str(session_id) in user_data["beta_feedback"]:
                     return user_data["beta_feedback"][str(session_id)]
@@ -161,7 +220,7 @@ Focus on:
         st.title(f"🦋 Beta Reader: {feedback.get('session_title', 'Session')}")
         
         try:
-            generated_date = datetime.fromisoformat(feedback['generated_at']).strftime('%B %d, %Y at %I:%M %p')
+            generated_date = format_feedback_date(feedback['generated_at'])
             st.caption(f"Generated: {generated_date}")
         except:
             st.caption("Generated: Recently")
@@ -182,7 +241,7 @@ Focus on:
         feedback_text = feedback["feedback"]
         
         # Split into sections and highlight profile markers
-        parts = re.split(r'(\[PROFILE:.*?\])', feedback_text)
+        parts = _PROFILE_MARKER_RE.split(feedback_text)
         formatted_feedback = ""
         for i, part in enumerate(parts):
             if part.startswith('[PROFILE:') and part.endswith(']'):
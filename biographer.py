@@ -3,27 +3,27 @@ import streamlit as st
 import json
 from datetime import datetime, date, timedelta
 from openai import OpenAI
+import httpx
 import os
 import re
 import hashlib
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import hmac
 import secrets
 import string
 import time
 import shutil
+import tempfile
 import base64
-from PIL import Image
+import binascii
 import io
-import zipfile
 import html
-import subprocess
-import tempfile
 import csv
-import uuid
 import logging
+import copy
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from bisect import bisect_left
 
 # ============================================================================
 # PRODUCTION CONFIGURATION - MUST BE FIRST
@@ -48,21 +48,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'\w+')
+_TOKEN_RE = re.compile(r'\S+')
+_TAG_OR_WORD_RE = re.compile(r'<[^>]+>|(\w+)')
+_KEY_UNSAFE_RE = re.compile(r'[^\w\s]|_')
+_YEAR_RE = re.compile(r'\d{4}')
+_PROFILE_MARKER_RE = re.compile(r'(\[PROFILE:.*?\])')
+_REWRITE_QUOTES_RE = re.compile(r'^["\']|["\']$')
+_REWRITE_PREAMBLE_RE = re.compile(r'^Here\'s the rewritten version:?\s*', re.IGNORECASE)
+_MD_HEADING_RE = re.compile(r'#{1,6}\s*')
+_MD_LINK_RE = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+_IMG_TOKEN = '<img'
+
 # ============================================================================
 # ENVIRONMENT VALIDATION
 # ============================================================================
+@st.cache_resource
 def validate_environment():
-    """Check all required directories and files exist"""
+    """Check all required directories and files exist (once per server process)"""
+    # Parents are created by the nested paths (question_banks, uploads)
     required_dirs = [
         "question_banks/default", 
         "question_banks/users", 
-        "question_banks", 
-        "uploads", 
         "uploads/thumbnails", 
         "uploads/metadata", 
         "uploads/covers",
         "accounts", 
         "sessions", 
+        "responses",
         "backups",
         "logs"
     ]
@@ -103,12 +119,46 @@ try:
 except ImportError:
     logger.warning("EbookLib not available - EPUB export disabled")
 
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps_bytes(data, indent=False):
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0))
+    if indent:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(',', ':')).encode("utf-8")
+
+def read_json(path):
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+def b64encode_str(data):
+    if pybase64:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode()
+
 try:
     from topic_bank import TopicBank
     from session_manager import SessionManager
     from vignettes import VignetteManager
     from session_loader import SessionLoader
-    from beta_reader import BetaReader
+    from beta_reader import BetaReader, format_feedback_date
     from question_bank_manager import QuestionBankManager
     logger.info("All custom modules loaded successfully")
 except ImportError as e:
@@ -116,14 +166,26 @@ except ImportError as e:
     st.error(f"Error importing modules: {e}")
     st.info("Please ensure all .py files are in the same directory")
     TopicBank = SessionManager = VignetteManager = SessionLoader = BetaReader = QuestionBankManager = None
+    format_feedback_date = lambda iso_value: datetime.fromisoformat(iso_value).strftime('%B %d, %Y at %I:%M %p')
 
 DEFAULT_WORD_TARGET = 500
 
 # ============================================================================
 # INITIALIZATION WITH PRODUCTION-SAFE DEFAULTS
 # ============================================================================
-client = OpenAI(api_key=st.secrets.get("OPENAI_API_KEY", os.environ.get("OPENAI_API_KEY")))
-beta_reader = BetaReader(client) if BetaReader and client else None
+@st.cache_resource
+def get_openai_client():
+    # One pooled HTTP client per process so AI calls reuse warm keep-alive connections
+    return OpenAI(
+        api_key=st.secrets.get("OPENAI_API_KEY", os.environ.get("OPENAI_API_KEY")),
+        http_client=httpx.Client(limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=120))
+    )
+
+client = get_openai_client()
+@st.cache_resource
+def get_beta_reader():
+    """Built on first use and shared across reruns"""
+    return BetaReader(get_openai_client()) if BetaReader and client else None
 
 # Initialize session state with ALL possible keys (prevents KeyErrors)
 default_state = {
@@ -197,19 +259,28 @@ default_state = {
     "last_cleanup": None
 }
 
-for key, value in default_state.items():
-    if key not in st.session_state:
-        st.session_state[key] = value
+if not st.session_state.get("_defaults_applied"):
+    for key, value in default_state.items():
+        st.session_state.setdefault(key, value)
+    st.session_state._defaults_applied = True
 
 # Load external CSS with error handling
-try:
+@st.cache_resource(show_spinner=False)
+def load_css():
+    """Read styles.css once per process; the markup still has to be emitted on every rerun"""
     css_path = Path("styles.css")
-    if css_path.exists():
-        with open(css_path, encoding="utf-8") as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-        logger.info("CSS loaded successfully")
-    else:
+    if not css_path.exists():
         logger.warning("styles.css not found")
+        return ""
+    with open(css_path, encoding="utf-8") as f:
+        css = f"<style>{f.read()}</style>"
+    logger.info("CSS loaded successfully")
+    return css
+
+try:
+    css_markup = load_css()
+    if css_markup:
+        st.markdown(css_markup, unsafe_allow_html=True)
 except Exception as e:
     logger.error(f"Error loading CSS: {e}")
 
@@ -229,6 +300,44 @@ EMAIL_CONFIG = {
 # ============================================================================
 # GAMIFICATION SYSTEM - STREAKS & MILESTONES
 # ============================================================================
+def strip_html(content):
+    """Plain text of an HTML answer, using lxml's C parser when it is installed"""
+    if lxml_html and content and content.strip():
+        try:
+            return lxml_html.fromstring(content).text_content()
+        except Exception:
+            pass
+    return _TAG_RE.sub('', content)
+
+_EMPTY_CONTENT = frozenset({"", "<p><br></p>", "<p>Start writing your story here...</p>"})
+
+def _has_content(content):
+    """True when the editor holds something other than blank/placeholder markup"""
+    return bool(content) and content.strip() not in _EMPTY_CONTENT
+
+def count_html_words(html_text):
+    """Count words in an HTML answer in one regex pass; tag matches come back as empty groups"""
+    if not html_text:
+        return 0
+    tokens = _TAG_OR_WORD_RE.findall(html_text)
+    return len(tokens) - tokens.count('')
+
+def answer_word_count(q_data):
+    """Word count stored with the answer at save time; computed for answers saved before that"""
+    if "word_count" not in q_data:
+        q_data["word_count"] = count_html_words(q_data.get("answer", ""))
+    return q_data["word_count"]
+
+def answer_text(q_data):
+    """Tag-stripped answer stored at save time; computed for answers saved before that"""
+    if "text_only" not in q_data:
+        q_data["text_only"] = _TAG_RE.sub('', q_data.get("answer", ""))
+    return q_data["text_only"]
+
+def _has_min_words(text, n):
+    """True once n whitespace-separated words are seen; stops scanning there"""
+    return sum(1 for _ in islice(_TOKEN_RE.finditer(text), n)) >= n
+
 def update_writing_streak(user_id):
     """Update the user's writing streak based on today's activity"""
     if not user_id or not st.session_state.user_account:
@@ -265,8 +374,7 @@ def update_writing_streak(user_id):
                     if q_data.get("answer"):
                         timestamp = q_data.get("timestamp", "")
                         if timestamp and timestamp.startswith(today_str):
-                            text_only = re.sub(r'<[^>]+>', '', q_data["answer"])
-                            today_words += len(re.findall(r'\w+', text_only))
+                            today_words += answer_word_count(q_data)
         
         # Only count if at least 50 words written today
         if today_words >= 50:
@@ -328,10 +436,11 @@ def check_milestones(user_id, streak_data):
         
         # First Session Complete
         if not milestones.get('first_session_complete'):
+            answer_counts = get_answer_counts()
             for session in st.session_state.current_question_bank or []:
                 sid = session["id"]
                 if sid in st.session_state.responses:
-                    answered = len(st.session_state.responses[sid].get("questions", {}))
+                    answered = answer_counts[sid]
                     total = len(session["questions"])
                     if answered >= total and total > 0:
                         milestones['first_session_complete'] = True
@@ -355,8 +464,7 @@ def get_todays_word_count():
                 for q_data in st.session_state.responses[sid].get("questions", {}).values():
                     timestamp = q_data.get("timestamp", "")
                     if timestamp and timestamp.startswith(today):
-                        text_only = re.sub(r'<[^>]+>', '', q_data.get("answer", ""))
-                        total += len(re.findall(r'\w+', text_only))
+                        total += answer_word_count(q_data)
         
         return total
     except Exception as e:
@@ -458,8 +566,9 @@ def render_gamification_dashboard():
         with col2:
             sessions_completed = 0
             if st.session_state.current_question_bank:
+                answer_counts = get_answer_counts()
                 sessions_completed = sum(1 for s in st.session_state.current_question_bank 
-                                       if len(st.session_state.responses.get(s["id"], {}).get("questions", {})) >= len(s["questions"]))
+                                       if answer_counts[s["id"]] >= len(s["questions"]))
             st.metric("Sessions Done", f"{sessions_completed}/{len(st.session_state.current_question_bank) if st.session_state.current_question_bank else 0}")
         
         st.divider()
@@ -516,7 +625,7 @@ def get_historical_events_for_prompt(birth_year=None):
                     era = row.get('era_range', '')
                     year_num = None
                     if era and birth_year:
-                        years = re.findall(r'\d{4}', era)
+                        years = _YEAR_RE.findall(era)
                         if years:
                             year_num = int(years[0])
                     
@@ -534,14 +643,16 @@ def get_historical_events_for_prompt(birth_year=None):
 # ============================================================================
 # PROMPT ME - OVERCOME WRITER'S BLOCK
 # ============================================================================
-def generate_writing_prompts(session_title, question_text, existing_answer, profile_context, birth_year=None):
-    """Generate creative prompts to help overcome writer's block"""
+def generate_writing_prompts(session_title, question_text, existing_answer, profile_context, birth_year=None, placeholder=None):
+    """Generate creative prompts to help overcome writer's block; streams into placeholder when given"""
     if not client:
         logger.warning("OpenAI client not available for prompt generation")
         return {"error": "OpenAI client not available"}
     
     try:
-        clean_answer = re.sub(r'<[^>]+>', '', existing_answer) if existing_answer else ""
+        clean_answer = existing_answer or ""
+        if '<' in clean_answer:
+            clean_answer = _TAG_RE.sub('', clean_answer)
         
         historical_events = get_historical_events_for_prompt(birth_year)
         historical_context = ""
@@ -596,17 +707,32 @@ FORMAT YOUR RESPONSE WITH THESE SECTIONS:
 Keep the tone warm and supportive. Use the user's name if available in profile context.
 """
 
-        response = client.chat.completions.create(
+        stream = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": f"Please help me write about: {question_text}"}
             ],
             max_tokens=800,
-            temperature=0.8
+            temperature=0.8,
+            stream=True
         )
         
-        prompts = response.choices[0].message.content.strip()
+        parts = []
+        last_render = time.monotonic()
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            parts.append(delta)
+            # Re-render at most every 100ms so markdown isn't re-parsed per token
+            if placeholder is not None and time.monotonic() - last_render >= 0.1:
+                placeholder.markdown("".join(parts))
+                last_render = time.monotonic()
+        
+        prompts = "".join(parts).strip()
+        if placeholder is not None:
+            placeholder.markdown(prompts)
         logger.info(f"Generated prompts for: {question_text[:50]}...")
         
         return {
@@ -659,8 +785,9 @@ def show_prompt_me_modal():
         """, unsafe_allow_html=True)
         
         st.markdown('<div class="prompt-box">', unsafe_allow_html=True)
-        st.markdown(prompt_data['prompts'])
-        st.markdown('</div>', unsafe_allow_html=True)
+        # Full-width slot; New Prompts streams its replacement straight into it
+        prompts_slot = st.empty()
+        prompts_slot.markdown(prompt_data['prompts'])
         
         st.markdown("---")
         st.markdown("*These prompts are personalized based on your profile and what you've written so far.*")
@@ -686,7 +813,7 @@ def show_prompt_me_modal():
                     if st.session_state.user_account and 'profile' in st.session_state.user_account:
                         birthdate = st.session_state.user_account['profile'].get('birthdate', '')
                         if birthdate:
-                            year_match = re.search(r'\d{4}', birthdate)
+                            year_match = _YEAR_RE.search(birthdate)
                             if year_match:
                                 birth_year = int(year_match.group())
                     
@@ -695,12 +822,13 @@ def show_prompt_me_modal():
                         current_question_text,
                         existing_answer,
                         profile_context,
-                        birth_year
+                        birth_year,
+                        placeholder=prompts_slot
                     )
                     
                     if result.get('success'):
+                        # Already rendered in place; just keep it for later reruns
                         st.session_state.current_prompt_data = result
-                        st.rerun()
                     else:
                         st.error(result.get('error', 'Failed to generate prompts'))
         
@@ -710,7 +838,6 @@ def show_prompt_me_modal():
                 st.session_state.current_prompt_data = None
                 st.rerun()
     
-    st.markdown('</div>', unsafe_allow_html=True)
     st.stop()
 
 # ============================================================================
@@ -737,11 +864,11 @@ def create_backup():
         }
         
         backup_file = Path(f"backups/{st.session_state.user_id}_{timestamp}.json")
-        with open(backup_file, 'w') as f:
-            json.dump(backup_data, f, indent=2)
+        backup_bytes = json_dumps_bytes(backup_data, indent=True)
+        write_bytes_atomic(backup_file, backup_bytes)
         
         logger.info(f"Backup created: {backup_file}")
-        return json.dumps(backup_data, indent=2)
+        return backup_bytes.decode("utf-8")
     except Exception as e:
         logger.error(f"Backup failed: {e}")
         st.error(f"Backup failed: {e}")
@@ -749,7 +876,7 @@ def create_backup():
 
 def restore_from_backup(backup_json):
     try:
-        backup_data = json.loads(backup_json)
+        backup_data = json_loads(backup_json)
         if backup_data.get("user_id") != st.session_state.user_id:
             logger.warning(f"Backup user mismatch: {backup_data.get('user_id')} vs {st.session_state.user_id}")
             st.error("Backup belongs to a different user")
@@ -767,34 +894,64 @@ def restore_from_backup(backup_json):
         st.error(f"Restore failed: {e}")
         return False
 
+@st.cache_data(max_entries=32, show_spinner=False)
+def scan_backups(user_id, dir_mtime):
+    """Backup entries for a user; the date comes from the {user_id}_{%Y%m%d_%H%M%S}.json filename"""
+    backups = []
+    for f in Path("backups").glob(f"{user_id}_*.json"):
+        try:
+            date_str = datetime.strptime(f.stem[len(user_id) + 1:], "%Y%m%d_%H%M%S").isoformat()
+        except ValueError:
+            # Not our naming scheme - fall back to the stored date
+            try:
+                date_str = read_json(f).get("backup_date", "Unknown")
+            except Exception as e:
+                logger.error(f"Error reading backup {f}: {e}")
+                continue
+        try:
+            backups.append({"filename": f.name, "date": date_str, "size": f.stat().st_size})
+        except OSError as e:
+            logger.error(f"Error reading backup {f}: {e}")
+    return sorted(backups, key=lambda x: x["date"], reverse=True)
+
 def list_backups():
     if not st.session_state.user_id:
         return []
     
-    backups = []
     try:
         backup_dir = Path("backups")
         if backup_dir.exists():
-            for f in backup_dir.glob(f"{st.session_state.user_id}_*.json"):
-                try:
-                    with open(f, 'r') as file:
-                        data = json.load(file)
-                        backups.append({
-                            "filename": f.name,
-                            "date": data.get("backup_date", "Unknown"),
-                            "size": f.stat().st_size
-                        })
-                except Exception as e:
-                    logger.error(f"Error reading backup {f}: {e}")
-                    continue
+            return scan_backups(st.session_state.user_id, backup_dir.stat().st_mtime_ns)
     except Exception as e:
         logger.error(f"Error listing backups: {e}")
     
-    return sorted(backups, key=lambda x: x["date"], reverse=True)
+    return []
 
 # ============================================================================
 # IMAGE HANDLER WITH PRODUCTION SAFEGUARDS
 # ============================================================================
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_image_metadata_index(user_id, metadata_dir, dir_mtime):
+    """Group a user's image metadata by (session_id, question); dir_mtime keys the cache so adds/deletes rebuild it"""
+    index = {}
+    try:
+        for fname in Path(metadata_dir).glob("*.json"):
+            try:
+                meta = read_json(fname)
+                if meta.get("user_id") == user_id:
+                    index.setdefault((meta.get("session_id"), meta.get("question")), []).append(meta)
+            except Exception as e:
+                logger.error(f"Error reading metadata {fname}: {e}")
+                continue
+    except Exception as e:
+        logger.error(f"Error listing metadata directory: {e}")
+    return index
+
+def encode_image_file(path):
+    """Base64 of an image file; not cached itself, since build_export_data caches the finished export"""
+    with open(path, 'rb') as f:
+        return b64encode_str(f.read())
+
 class ImageHandler:
     def __init__(self, user_id=None):
         self.user_id = user_id
@@ -808,17 +965,30 @@ class ImageHandler:
             "max_file_size_mb": 5,
             "aspect_ratio": 1.6
         }
+        self._user_path = None
     
     def get_user_path(self):
-        if self.user_id:
-            user_hash = hashlib.md5(self.user_id.encode()).hexdigest()[:8]
+        if self._user_path is None:
+            if not self.user_id:
+                return self.base_path
+            user_hash = hashlib.blake2b(self.user_id.encode(), digest_size=4).hexdigest()
             path = self.base_path / f"user_{user_hash}"
-            path.mkdir(parents=True, exist_ok=True)
+            if not path.exists():
+                # Folders created before the switch from md5 are moved over on first use
+                legacy = self.base_path / f"user_{hashlib.md5(self.user_id.encode()).hexdigest()[:8]}"
+                if legacy.exists():
+                    try:
+                        os.replace(legacy, path)
+                        logger.info(f"Migrated {legacy} to {path}")
+                    except OSError as e:
+                        logger.error(f"Error migrating image folder: {e}")
+                        path = legacy
             (path / "thumbnails").mkdir(parents=True, exist_ok=True)
-            return path
-        return self.base_path
+            self._user_path = path
+        return self._user_path
     
     def optimize_image(self, image, max_width=1600, is_thumbnail=False):
+        from PIL import Image
         try:
             if image.mode in ('RGBA', 'LA', 'P'):
                 bg = Image.new('RGB', image.size, (255, 255, 255))
@@ -854,33 +1024,43 @@ class ImageHandler:
             return image
     
     def save_image(self, uploaded_file, session_id, question_text, caption="", usage="full_page"):
+        from PIL import Image
         try:
-            image_data = uploaded_file.read()
-            original_size = len(image_data) / (1024 * 1024)
+            uploaded_file.seek(0, os.SEEK_END)
+            original_size = uploaded_file.tell() / (1024 * 1024)
+            uploaded_file.seek(0)
             
             if original_size > self.settings["max_file_size_mb"]:
                 logger.warning(f"Large image ({original_size:.1f}MB). Will be optimized.")
             
-            img = Image.open(io.BytesIO(image_data))
+            img = Image.open(uploaded_file)
             target_width = self.settings["full_width"] if usage == "full_page" else self.settings["inline_width"]
+            if img.format == "JPEG" and img.width > target_width:
+                # Let libjpeg decode at a reduced scale (still >= target); LANCZOS finishes the resize
+                img.draft("RGB", (target_width, target_width * img.height // img.width))
             
-            image_id = hashlib.md5(f"{self.user_id}{session_id}{question_text}{datetime.now()}".encode()).hexdigest()[:16]
-            
-            optimized_img = self.optimize_image(img, target_width, is_thumbnail=False)
-            thumb_img = self.optimize_image(img, is_thumbnail=True)
+            image_id = secrets.token_hex(8)
+            user_path = self.get_user_path()
+            main_path = user_path / f"{image_id}.jpg"
+            thumb_path = user_path / "thumbnails" / f"{image_id}.webp"
             
-            main_buffer = io.BytesIO()
-            optimized_img.save(main_buffer, format="JPEG", quality=self.settings["quality"], optimize=True)
-            main_size = len(main_buffer.getvalue()) / (1024 * 1024)
+            def write_main(src):
+                optimized = self.optimize_image(src, target_width, is_thumbnail=False)
+                optimized.save(main_path, format="JPEG", quality=self.settings["quality"], optimize=True)
+                return optimized
             
-            thumb_buffer = io.BytesIO()
-            thumb_img.save(thumb_buffer, format="JPEG", quality=70, optimize=True)
+            def write_thumb(src):
+                self.optimize_image(src, is_thumbnail=True).save(thumb_path, format="WEBP", quality=80, method=4)
             
-            user_path = self.get_user_path()
-            with open(user_path / f"{image_id}.jpg", 'wb') as f: 
-                f.write(main_buffer.getvalue())
-            with open(user_path / "thumbnails" / f"{image_id}.jpg", 'wb') as f: 
-                f.write(thumb_buffer.getvalue())
+            # Decode once up front, then hand each worker its own copy: optimize_image can
+            # return its input unchanged (RGB and already narrow enough), so they must not share one
+            img.load()
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                main_future = executor.submit(write_main, img.copy())
+                thumb_future = executor.submit(write_thumb, img.copy())
+                optimized_img = main_future.result()
+                thumb_future.result()
+            main_size = main_path.stat().st_size / (1024 * 1024)
             
             metadata = {
                 "id": image_id, "session_id": session_id, "question": question_text,
@@ -893,8 +1073,8 @@ class ImageHandler:
             
             metadata_path = self.base_path / "metadata" / f"{image_id}.json"
             metadata_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(metadata_path, 'w') as f: 
-                json.dump(metadata, f, indent=2)
+            # Atomic, so a rerun keyed on the directory mtime never caches a half-written entry
+            write_bytes_atomic(metadata_path, json_dumps_bytes(metadata, indent=True))
             
             reduction = ((original_size - main_size) / original_size) * 100 if original_size > 0 else 0
             if reduction > 20:
@@ -912,43 +1092,13 @@ class ImageHandler:
             logger.error(f"Error saving image: {e}")
             return None
     
-    def get_image_html(self, image_id, thumbnail=False):
-        try:
-            user_path = self.get_user_path()
-            path = user_path / "thumbnails" / f"{image_id}.jpg" if thumbnail else user_path / f"{image_id}.jpg"
-            if not path.exists(): 
-                return None
-            
-            with open(path, 'rb') as f: 
-                image_data = f.read()
-            b64 = base64.b64encode(image_data).decode()
-            
-            meta_path = self.base_path / "metadata" / f"{image_id}.json"
-            caption = ""
-            dimensions = ""
-            if meta_path.exists():
-                with open(meta_path, 'r') as f:
-                    metadata = json.load(f)
-                    caption = metadata.get("caption", "")
-                    dimensions = metadata.get("dimensions", "")
-            
-            return {
-                "html": f'<img src="data:image/jpeg;base64,{b64}" class="story-image" alt="{caption}" data-dimensions="{dimensions}">',
-                "caption": caption, "base64": b64, "dimensions": dimensions
-            }
-        except Exception as e:
-            logger.error(f"Error getting image HTML: {e}")
-            return None
-    
     def get_image_base64(self, image_id):
         try:
-            user_path = self.get_user_path()
-            path = user_path / f"{image_id}.jpg"
-            if not path.exists(): 
+            path = self.get_user_path() / f"{image_id}.jpg"
+            try:
+                return encode_image_file(path)
+            except FileNotFoundError:
                 return None
-            with open(path, 'rb') as f: 
-                image_data = f.read()
-            return base64.b64encode(image_data).decode()
         except Exception as e:
             logger.error(f"Error getting image base64: {e}")
             return None
@@ -957,40 +1107,37 @@ class ImageHandler:
         meta_path = self.base_path / "metadata" / f"{image_id}.json"
         if meta_path.exists():
             try:
-                with open(meta_path, 'r') as f:
-                    metadata = json.load(f)
-                    return metadata.get("caption", "")
+                return read_json(meta_path).get("caption", "")
             except Exception as e:
                 logger.error(f"Error getting image caption: {e}")
         return ""
     
-    def get_images_for_answer(self, session_id, question_text):
-        images = []
+    def _get_metadata_index(self):
         metadata_dir = self.base_path / "metadata"
-        if not metadata_dir.exists(): 
-            return images
-        
         try:
-            for fname in metadata_dir.glob("*.json"):
-                try:
-                    with open(fname) as f: 
-                        meta = json.load(f)
-                    if (meta.get("session_id") == session_id and 
-                        meta.get("question") == question_text and 
-                        meta.get("user_id") == self.user_id):
-                        thumb = self.get_image_html(meta["id"], thumbnail=True)
-                        full = self.get_image_html(meta["id"])
-                        if thumb and full:
-                            images.append({
-                                **meta, 
-                                "thumb_html": thumb["html"], 
-                                "full_html": full["html"]
-                            })
-                except Exception as e:
-                    logger.error(f"Error reading metadata {fname}: {e}")
-                    continue
-        except Exception as e:
-            logger.error(f"Error listing metadata directory: {e}")
+            dir_mtime = metadata_dir.stat().st_mtime_ns
+        except OSError:
+            return {}
+        return load_image_metadata_index(self.user_id, str(metadata_dir), dir_mtime)
+    
+    def get_image_path(self, image_id, thumbnail=False):
+        user_path = self.get_user_path()
+        if thumbnail:
+            # New thumbnails are WebP; older uploads still have JPEG ones
+            for ext in ("webp", "jpg"):
+                path = user_path / "thumbnails" / f"{image_id}.{ext}"
+                if path.exists():
+                    return path
+            return None
+        path = user_path / f"{image_id}.jpg"
+        return path if path.exists() else None
+    
+    def get_images_for_answer(self, session_id, question_text):
+        images = []
+        for meta in self._get_metadata_index().get((session_id, question_text), []):
+            thumb_path = self.get_image_path(meta["id"], thumbnail=True)
+            if thumb_path:
+                images.append({**meta, "thumb_path": str(thumb_path)})
         
         return sorted(images, key=lambda x: x.get("timestamp", ""), reverse=True)
     
@@ -1000,6 +1147,7 @@ class ImageHandler:
             files_to_delete = [
                 user_path / f"{image_id}.jpg",
                 user_path / "thumbnails" / f"{image_id}.jpg",
+                user_path / "thumbnails" / f"{image_id}.webp",
                 self.base_path / "metadata" / f"{image_id}.json"
             ]
             
@@ -1025,11 +1173,28 @@ def generate_password(length=12):
     alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
     return ''.join(secrets.choice(alphabet) for _ in range(length))
 
+SCRYPT_PARAMS = {"n": 2 ** 14, "r": 8, "p": 1}
+
 def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+    salt = secrets.token_bytes(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, dklen=32, **SCRYPT_PARAMS)
+    return f"scrypt${SCRYPT_PARAMS['n']}${SCRYPT_PARAMS['r']}${SCRYPT_PARAMS['p']}${salt.hex()}${digest.hex()}"
+
+def is_legacy_password_hash(stored_hash):
+    return not stored_hash.startswith("scrypt$")
 
 def verify_password(stored_hash, password):
-    return stored_hash == hash_password(password)
+    if is_legacy_password_hash(stored_hash):
+        # Accounts created before scrypt hold an unsalted sha256 digest
+        return hmac.compare_digest(stored_hash, hashlib.sha256(password.encode()).hexdigest())
+    try:
+        _, n, r, p, salt_hex, digest_hex = stored_hash.split("$")
+        digest = hashlib.scrypt(password.encode(), salt=bytes.fromhex(salt_hex), dklen=len(digest_hex) // 2,
+                                n=int(n), r=int(r), p=int(p))
+        return hmac.compare_digest(digest.hex(), digest_hex)
+    except Exception as e:
+        logger.error(f"Error verifying password: {e}")
+        return False
 
 def create_user_account(user_data, password=None):
     try:
@@ -1100,12 +1265,57 @@ def create_user_account(user_data, password=None):
         logger.error(f"Error creating user account: {e}")
         return {"success": False, "error": str(e)}
 
+def write_bytes_atomic(path, payload):
+    """Write bytes to a uniquely named temp file next to path, then swap it into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file next to path, then swap it into place"""
+    write_bytes_atomic(path, json_dumps_bytes(data))
+
+def _report_account_save(future):
+    """Log and show a failed background account save; returns whether it succeeded"""
+    try:
+        ok = future.result()
+    except Exception as e:
+        logger.error(f"Background account save failed: {e}")
+        ok = False
+    if not ok:
+        st.error("Your latest account changes could not be saved. Please try again.")
+    return ok
+
+def wait_for_account_save():
+    """Block until a queued background account save has landed; False if it failed"""
+    pending_save = st.session_state.pop('_pending_account_save', None)
+    return _report_account_save(pending_save) if pending_save else True
+
+def check_account_save():
+    """Report a finished background account save without blocking on one still running"""
+    pending_save = st.session_state.get('_pending_account_save')
+    if pending_save and pending_save.done():
+        del st.session_state._pending_account_save
+        _report_account_save(pending_save)
+
 def save_account_data(user_record):
+    # Synchronous saves wait for the background writer so the two never rewrite the same files at once
+    wait_for_account_save()
+    return _write_account_data(user_record)
+
+def _write_account_data(user_record):
     try:
         account_path = Path(f"accounts/{user_record['user_id']}_account.json")
         account_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(account_path, 'w') as f:
-            json.dump(user_record, f, indent=2)
+        write_json_atomic(account_path, user_record)
         update_accounts_index(user_record)
         logger.info(f"Account data saved for {user_record['user_id']}")
         return True
@@ -1113,50 +1323,64 @@ def save_account_data(user_record):
         logger.error(f"Error saving account data: {e}")
         return False
 
+@st.cache_resource
+def get_save_executor():
+    # One worker keeps background saves of the same account in submission order
+    return ThreadPoolExecutor(max_workers=1)
+
+def save_account_data_async(user_record):
+    """Queue an account save on the background writer; the record is copied so later edits don't race it"""
+    # Report the previous save before its future is replaced
+    check_account_save()
+    future = get_save_executor().submit(_write_account_data, copy.deepcopy(user_record))
+    st.session_state._pending_account_save = future
+    return future
+
 def update_accounts_index(user_record):
     try:
         index_file = Path("accounts/accounts_index.json")
         index = {}
         if index_file.exists():
-            with open(index_file, 'r') as f:
-                index = json.load(f)
+            index = read_json(index_file)
         
         index[user_record['user_id']] = {
             "email": user_record['email'], 
             "first_name": user_record['profile']['first_name'],
             "last_name": user_record['profile']['last_name'], 
             "created_at": user_record['created_at'],
-            "account_type": user_record['account_type']
+            "account_type": user_record['account_type'],
+            "last_login": user_record.get('last_login')
         }
         
-        with open(index_file, 'w') as f: 
-            json.dump(index, f, indent=2)
+        write_json_atomic(index_file, index)
         
         return True
     except Exception as e:
         logger.error(f"Error updating accounts index: {e}")
         return False
 
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_email_index(index_path, index_mtime):
+    """Map lowercased email -> user_id from the accounts index; index_mtime keys the cache"""
+    index = read_json(index_path)
+    return {data.get("email", "").lower(): uid for uid, data in index.items()}
+
 def get_account_data(user_id=None, email=None):
     try:
         if user_id:
             account_path = Path(f"accounts/{user_id}_account.json")
             if account_path.exists(): 
-                with open(account_path, 'r') as f:
-                    return json.load(f)
+                return read_json(account_path)
         
         if email:
             email = email.lower().strip()
             index_file = Path("accounts/accounts_index.json")
             if index_file.exists():
-                with open(index_file, 'r') as f:
-                    index = json.load(f)
-                for uid, data in index.items():
-                    if data.get("email", "").lower() == email:
-                        account_path = Path(f"accounts/{uid}_account.json")
-                        if account_path.exists():
-                            with open(account_path, 'r') as f:
-                                return json.load(f)
+                uid = load_email_index(str(index_file), index_file.stat().st_mtime_ns).get(email)
+                if uid:
+                    account_path = Path(f"accounts/{uid}_account.json")
+                    if account_path.exists():
+                        return read_json(account_path)
     except Exception as e:
         logger.error(f"Error getting account data: {e}")
     
@@ -1166,6 +1390,9 @@ def authenticate_user(email, password):
     try:
         account = get_account_data(email=email)
         if account and verify_password(account['password_hash'], password):
+            if is_legacy_password_hash(account['password_hash']):
+                account['password_hash'] = hash_password(password)
+                logger.info(f"Upgraded password hash for {account['user_id']}")
             account['last_login'] = datetime.now().isoformat()
             save_account_data(account)
             logger.info(f"User authenticated: {account['user_id']}")
@@ -1177,6 +1404,9 @@ def authenticate_user(email, password):
         return {"success": False, "error": str(e)}
 
 def send_welcome_email(user_data, credentials):
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
     try:
         if not EMAIL_CONFIG['sender_email'] or not EMAIL_CONFIG['sender_password']:
             logger.warning("Email credentials not configured")
@@ -1215,6 +1445,9 @@ def send_welcome_email(user_data, credentials):
 
 def logout_user():
     logger.info(f"User logged out: {st.session_state.get('user_id')}")
+    flush_user_data()
+    # Let a queued background save land before the account is read again
+    wait_for_account_save()
     st.session_state.qb_manager = None
     st.session_state.qb_manager_initialized = False
     st.session_state.image_handler = None
@@ -1234,7 +1467,10 @@ def logout_user():
         'current_rewrite_data', 'show_ai_rewrite', 'show_ai_rewrite_menu',
         'show_publisher', 'cover_image_data', 'show_prompt_modal', 'current_prompt_data',
         'milestone_achieved_first_story', 'milestone_achieved_seven_day',
-        'milestone_achieved_five_thousand', 'milestone_achieved_first_session'
+        'milestone_achieved_five_thousand', 'milestone_achieved_first_session',
+        '_defaults_applied', 'search_index', '_search_memo',
+        '_dirty_sessions', '_hydrated_shards',
+        'session_index_by_id', 'session_by_id', '_indexed_bank', 'vignette_manager', 'session_manager'
     ]
     
     for key in keys_to_clear:
@@ -1313,42 +1549,33 @@ def show_privacy_settings():
     st.markdown("- AI analysis is temporary and private")
     
     if st.button("💾 Save Privacy Settings", key="privacy_save_btn", type="primary", use_container_width=True):
-        save_account_data(st.session_state.user_account)
+        save_account_data_async(st.session_state.user_account)
         st.success("Privacy settings saved!")
         time.sleep(1)
         st.rerun()
     
-    st.markdown('</div>', unsafe_allow_html=True)
     st.stop()
 
 # ============================================================================
 # PERFECT COVER DESIGNER
 # ============================================================================
-def show_cover_designer():
-    st.markdown('<div class="modal-overlay">', unsafe_allow_html=True)
-    st.title("🎨 Cover Designer")
-    st.success("✅ Exports as HTML - Preview matches export exactly!")
-    
-    if st.button("← Back", key="cover_back_btn"):
-        st.session_state.show_cover_designer = False
-        st.rerun()
-    
-    st.markdown("### Design your book cover - Portrait format (6\" x 9\")")
-    
-    saved_cover = st.session_state.user_account.get('cover_design', {}) if st.session_state.user_account else {}
-    
+MAX_COVER_BYTES = 10 * 1024 * 1024
+
+@st.fragment
+def _cover_designer_body(saved_cover, profile, first_name):
+    """Options, preview and save; a fragment so editing a field reruns only this part"""
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("**Cover Options**")
         
-        default_title = f"{st.session_state.user_account.get('profile', {}).get('first_name', 'My')}'s Story"
+        default_title = f"{first_name or 'My'}'s Story"
         title = st.text_input("Book Title", value=saved_cover.get('title', default_title), key="cover_title_input")
         
         subtitle = st.text_input("Subtitle (optional)", value=saved_cover.get('subtitle', ''), 
                                 placeholder="A brief subtitle or tagline", key="cover_subtitle_input")
         
-        default_author = f"{st.session_state.user_account.get('profile', {}).get('first_name', '')} {st.session_state.user_account.get('profile', {}).get('last_name', '')}".strip()
+        default_author = f"{first_name} {profile.get('last_name', '')}".strip()
         author = st.text_input("Author Name", value=saved_cover.get('author', default_author if default_author else "Author Name"), 
                               key="cover_author_input")
         
@@ -1386,6 +1613,9 @@ def show_cover_designer():
         
         uploaded_cover = st.file_uploader("Upload Cover Image (optional)", type=['jpg', 'jpeg', 'png'], 
                                          key="cover_image_uploader")
+        if uploaded_cover and uploaded_cover.size > MAX_COVER_BYTES:
+            st.error(f"Cover image is too large ({uploaded_cover.size / (1024 * 1024):.1f}MB). Maximum is 10MB.")
+            uploaded_cover = None
         if uploaded_cover:
             st.image(uploaded_cover, caption="New cover image", width=250)
     
@@ -1394,12 +1624,12 @@ def show_cover_designer():
         
         if uploaded_cover:
             img_bytes = uploaded_cover.getvalue()
-            img_base64 = base64.b64encode(img_bytes).decode()
+            img_base64 = b64encode_str(img_bytes)
             use_image = True
         elif saved_cover.get('cover_image') and Path(saved_cover['cover_image']).exists():
             with open(saved_cover['cover_image'], 'rb') as f:
                 img_bytes = f.read()
-            img_base64 = base64.b64encode(img_bytes).decode()
+            img_base64 = b64encode_str(img_bytes)
             use_image = True
         else:
             use_image = False
@@ -1645,11 +1875,12 @@ def show_cover_designer():
                 
                 if uploaded_cover:
                     img_path = f"uploads/covers/{st.session_state.user_id}_cover_bg.jpg"
+                    uploaded_cover.seek(0)
                     with open(img_path, 'wb') as f:
-                        f.write(uploaded_cover.getbuffer())
+                        shutil.copyfileobj(uploaded_cover, f, length=1 << 20)
                     st.session_state.user_account['cover_design']['cover_image'] = img_path
                 
-                save_account_data(st.session_state.user_account)
+                save_account_data_async(st.session_state.user_account)
                 
                 st.success("✅ Cover HTML saved successfully!")
                 
@@ -1669,8 +1900,25 @@ def show_cover_designer():
             except Exception as e:
                 logger.error(f"Error saving cover: {e}")
                 st.error(f"Error saving cover: {str(e)}")
+
+def show_cover_designer():
+    st.markdown('<div class="modal-overlay">', unsafe_allow_html=True)
+    st.title("🎨 Cover Designer")
+    st.success("✅ Exports as HTML - Preview matches export exactly!")
+    
+    if st.button("← Back", key="cover_back_btn"):
+        st.session_state.show_cover_designer = False
+        st.rerun()
+    
+    st.markdown("### Design your book cover - Portrait format (6\" x 9\")")
+    
+    account = st.session_state.user_account or {}
+    saved_cover = account.get('cover_design', {})
+    profile = account.get('profile') or {}
+    first_name = profile.get('first_name', '')
+    
+    _cover_designer_body(saved_cover, profile, first_name)
     
-    st.markdown('</div>', unsafe_allow_html=True)
     st.stop()
 
 # ============================================================================
@@ -1685,6 +1933,12 @@ def get_narrative_gps_for_ai():
         if not gps:
             return ""
         
+        # Rebuilt only after the GPS is saved (which bumps '_v')
+        cache_key = (st.session_state.user_id, gps.get('_v', 0))
+        cached = st.session_state.get('_gps_context')
+        if cached and cached[0] == cache_key:
+            return cached[1]
+        
         context = "\n\n=== BOOK PROJECT CONTEXT (From Narrative GPS) ===\n"
         
         if gps.get('book_title') or gps.get('genre') or gps.get('book_length'):
@@ -1745,6 +1999,7 @@ def get_narrative_gps_for_ai():
             if gps.get('feedback_style'): context += f"- Feedback Preference: {gps['feedback_style']}\n"
             if gps.get('unspoken'): context += f"- Hopes for Collaboration: {gps['unspoken']}\n"
         
+        st.session_state._gps_context = (cache_key, context)
         return context
     except Exception as e:
         logger.error(f"Error getting narrative GPS: {e}")
@@ -1753,6 +2008,20 @@ def get_narrative_gps_for_ai():
 # ============================================================================
 # AI REWRITE FUNCTION
 # ============================================================================
+@st.cache_data(ttl=3600, max_entries=200, show_spinner=False)
+def cached_rewrite_completion(system_prompt, max_tokens):
+    """Rewrite call keyed on the full prompt (text, voice, question and profile), so repeats don't hit the API"""
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": "Please rewrite this in the specified voice."}
+        ],
+        max_tokens=max_tokens,
+        temperature=0.7
+    )
+    return response.choices[0].message.content.strip()
+
 def ai_rewrite_answer(original_text, person_option, question_text, session_title):
     """Rewrite the user's answer in 1st, 2nd, or 3rd person using profile context"""
     if not client:
@@ -1771,9 +2040,10 @@ def ai_rewrite_answer(original_text, person_option, question_text, session_title
                 if ep.get('life_lessons'): enhanced_context += f"• Life Philosophy: {ep['life_lessons'][:200]}...\n"
                 if ep.get('legacy'): enhanced_context += f"• Legacy Hope: {ep['legacy'][:200]}...\n"
         
-        clean_text = re.sub(r'<[^>]+>', '', original_text)
+        clean_text = _TAG_RE.sub('', original_text)
+        word_count = len(clean_text.split())
         
-        if len(clean_text.split()) < 5:
+        if word_count < 5:
             return {"error": "Text too short to rewrite (minimum 5 words)"}
         
         person_instructions = {
@@ -1825,20 +2095,10 @@ ORIGINAL ANSWER (to rewrite):
 
 REWRITTEN VERSION ({person_instructions[person_option]['name']}):"""
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": "Please rewrite this in the specified voice."}
-            ],
-            max_tokens=len(clean_text.split()) * 3,
-            temperature=0.7
-        )
-        
-        rewritten = response.choices[0].message.content.strip()
+        rewritten = cached_rewrite_completion(system_prompt, word_count * 3)
         
-        rewritten = re.sub(r'^["\']|["\']$', '', rewritten)
-        rewritten = re.sub(r'^Here\'s the rewritten version:?\s*', '', rewritten, flags=re.IGNORECASE)
+        rewritten = _REWRITE_QUOTES_RE.sub('', rewritten)
+        rewritten = _REWRITE_PREAMBLE_RE.sub('', rewritten)
         
         logger.info(f"AI rewrite completed for {person_option} person")
         
@@ -1942,501 +2202,631 @@ def render_enhanced_profile():
     ep = st.session_state.user_account['enhanced_profile']
     
     with st.expander("👶 Early Years & Family Origins", expanded=False):
-        st.markdown("**Where and when were you born?**")
-        ep['birth_place'] = st.text_input("Birth place", value=ep.get('birth_place', ''), key="ep_birth_place_input")
-        
-        st.markdown("**Tell me about your parents - who were they? What were their personalities, dreams, and life stories?**")
-        ep['parents'] = st.text_area("Parents", value=ep.get('parents', ''), key="ep_parents_input", height=100)
-        
-        st.markdown("**Did you have siblings? What was your birth order and relationship with them?**")
-        ep['siblings'] = st.text_area("Siblings", value=ep.get('siblings', ''), key="ep_siblings_input", height=100)
-        
-        st.markdown("**What was your childhood home like? The neighborhood, the house, the atmosphere?**")
-        ep['childhood_home'] = st.text_area("Childhood home", value=ep.get('childhood_home', ''), key="ep_home_input", height=100)
-        
-        st.markdown("**What family traditions, values, or cultural background shaped your early years?**")
-        ep['family_traditions'] = st.text_area("Family traditions", value=ep.get('family_traditions', ''), key="ep_traditions_input", height=100)
+        with st.form("ep_section_form_1"):
+            st.markdown("**Where and when were you born?**")
+            ep['birth_place'] = st.text_input("Birth place", value=ep.get('birth_place', ''), key="ep_birth_place_input")
+            
+            st.markdown("**Tell me about your parents - who were they? What were their personalities, dreams, and life stories?**")
+            ep['parents'] = st.text_area("Parents", value=ep.get('parents', ''), key="ep_parents_input", height=100)
+            
+            st.markdown("**Did you have siblings? What was your birth order and relationship with them?**")
+            ep['siblings'] = st.text_area("Siblings", value=ep.get('siblings', ''), key="ep_siblings_input", height=100)
+            
+            st.markdown("**What was your childhood home like? The neighborhood, the house, the atmosphere?**")
+            ep['childhood_home'] = st.text_area("Childhood home", value=ep.get('childhood_home', ''), key="ep_home_input", height=100)
+            
+            st.markdown("**What family traditions, values, or cultural background shaped your early years?**")
+            ep['family_traditions'] = st.text_area("Family traditions", value=ep.get('family_traditions', ''), key="ep_traditions_input", height=100)
+            
+            if st.form_submit_button("💾 Save Section", type="primary", use_container_width=True):
+                save_account_data_async(st.session_state.user_account)
+                st.success("Biographer's profile saved!")
     
     with st.expander("🎓 Education & Formative Years", expanded=False):
-        st.markdown("**What was your school experience like? Favorite teachers? Subjects you loved or hated?**")
-        ep['school'] = st.text_area("School years", value=ep.get('school', ''), key="ep_school_input", height=100)
-        
-        st.markdown("**Did you pursue higher education? What influenced your choices?**")
-        ep['higher_ed'] = st.text_area("Higher education", value=ep.get('higher_ed', ''), key="ep_higher_ed_input", height=100)
-        
-        st.markdown("**Who were your mentors or influential figures during these years?**")
-        ep['mentors'] = st.text_area("Mentors", value=ep.get('mentors', ''), key="ep_mentors_input", height=100)
-        
-        st.markdown("**What books, ideas, or experiences shaped your worldview?**")
-        ep['influences'] = st.text_area("Influences", value=ep.get('influences', ''), key="ep_influences_input", height=100)
+        with st.form("ep_section_form_2"):
+            st.markdown("**What was your school experience like? Favorite teachers? Subjects you loved or hated?**")
+            ep['school'] = st.text_area("School years", value=ep.get('school', ''), key="ep_school_input", height=100)
+            
+            st.markdown("**Did you pursue higher education? What influenced your choices?**")
+            ep['higher_ed'] = st.text_area("Higher education", value=ep.get('higher_ed', ''), key="ep_higher_ed_input", height=100)
+            
+            st.markdown("**Who were your mentors or influential figures during these years?**")
+            ep['mentors'] = st.text_area("Mentors", value=ep.get('mentors', ''), key="ep_mentors_input", height=100)
+            
+            st.markdown("**What books, ideas, or experiences shaped your worldview?**")
+            ep['influences'] = st.text_area("Influences", value=ep.get('influences', ''), key="ep_influences_input", height=100)
+            
+            if st.form_submit_button("💾 Save Section", type="primary", use_container_width=True):
+                save_account_data_async(st.session_state.user_account)
+                st.success("Biographer's profile saved!")
     
     with st.expander("💼 Career & Life's Work", expanded=False):
-        st.markdown("**What was your first job? What did you learn from it?**")
-        ep['first_job'] = st.text_area("First job", value=ep.get('first_job', ''), key="ep_first_job_input", height=100)
-        
-        st.markdown("**Describe your career path - the twists, turns, and defining moments.**")
-        ep['career_path'] = st.text_area("Career path", value=ep.get('career_path', ''), key="ep_career_input", height=100)
-        
-        st.markdown("**What achievements are you most proud of?**")
-        ep['achievements'] = st.text_area("Achievements", value=ep.get('achievements', ''), key="ep_achievements_input", height=100)
-        
-        st.markdown("**What work or projects brought you the most fulfillment?**")
-        ep['fulfillment'] = st.text_area("Fulfilling work", value=ep.get('fulfillment', ''), key="ep_fulfillment_input", height=100)
+        with st.form("ep_section_form_3"):
+            st.markdown("**What was your first job? What did you learn from it?**")
+            ep['first_job'] = st.text_area("First job", value=ep.get('first_job', ''), key="ep_first_job_input", height=100)
+            
+            st.markdown("**Describe your career path - the twists, turns, and defining moments.**")
+            ep['career_path'] = st.text_area("Career path", value=ep.get('career_path', ''), key="ep_career_input", height=100)
+            
+            st.markdown("**What achievements are you most proud of?**")
+            ep['achievements'] = st.text_area("Achievements", value=ep.get('achievements', ''), key="ep_achievements_input", height=100)
+            
+            st.markdown("**What work or projects brought you the most fulfillment?**")
+            ep['fulfillment'] = st.text_area("Fulfilling work", value=ep.get('fulfillment', ''), key="ep_fulfillment_input", height=100)
+            
+            if st.form_submit_button("💾 Save Section", type="primary", use_container_width=True):
+                save_account_data_async(st.session_state.user_account)
+                st.success("Biographer's profile saved!")
     
     with st.expander("❤️ Relationships & Love", expanded=False):
-        st.markdown("**Tell me about your romantic relationships - first loves, significant partnerships.**")
-        ep['romance'] = st.text_area("Romantic relationships", value=ep.get('romance', ''), key="ep_romance_input", height=100)
-        
-        st.markdown("**If married, how did you meet? What has the journey been like?**")
-        ep['marriage'] = st.text_area("Marriage story", value=ep.get('marriage', ''), key="ep_marriage_input", height=100)
-        
-        st.markdown("**Tell me about your children, if any - their personalities, your relationship with them.**")
-        ep['children'] = st.text_area("Children", value=ep.get('children', ''), key="ep_children_input", height=100)
-        
-        st.markdown("**Who are your closest friends? What makes those friendships special?**")
-        ep['friends'] = st.text_area("Friendships", value=ep.get('friends', ''), key="ep_friends_input", height=100)
+        with st.form("ep_section_form_4"):
+            st.markdown("**Tell me about your romantic relationships - first loves, significant partnerships.**")
+            ep['romance'] = st.text_area("Romantic relationships", value=ep.get('romance', ''), key="ep_romance_input", height=100)
+            
+            st.markdown("**If married, how did you meet? What has the journey been like?**")
+            ep['marriage'] = st.text_area("Marriage story", value=ep.get('marriage', ''), key="ep_marriage_input", height=100)
+            
+            st.markdown("**Tell me about your children, if any - their personalities, your relationship with them.**")
+            ep['children'] = st.text_area("Children", value=ep.get('children', ''), key="ep_children_input", height=100)
+            
+            st.markdown("**Who are your closest friends? What makes those friendships special?**")
+            ep['friends'] = st.text_area("Friendships", value=ep.get('friends', ''), key="ep_friends_input", height=100)
+            
+            if st.form_submit_button("💾 Save Section", type="primary", use_container_width=True):
+                save_account_data_async(st.session_state.user_account)
+                st.success("Biographer's profile saved!")
     
     with st.expander("🌟 Challenges & Triumphs", expanded=False):
-        st.markdown("**What were the hardest moments in your life? How did you navigate them?**")
-        ep['challenges'] = st.text_area("Challenges", value=ep.get('challenges', ''), key="ep_challenges_input", height=100)
-        
-        st.markdown("**What losses have you experienced and how did they change you?**")
-        ep['losses'] = st.text_area("Losses", value=ep.get('losses', ''), key="ep_losses_input", height=100)
-        
-        st.markdown("**What are your proudest moments? Times when you felt truly alive?**")
-        ep['proud_moments'] = st.text_area("Proud moments", value=ep.get('proud_moments', ''), key="ep_proud_input", height=100)
-        
-        st.markdown("**What obstacles did you overcome that defined who you are?**")
-        ep['overcame'] = st.text_area("Obstacles overcome", value=ep.get('overcame', ''), key="ep_overcame_input", height=100)
+        with st.form("ep_section_form_5"):
+            st.markdown("**What were the hardest moments in your life? How did you navigate them?**")
+            ep['challenges'] = st.text_area("Challenges", value=ep.get('challenges', ''), key="ep_challenges_input", height=100)
+            
+            st.markdown("**What losses have you experienced and how did they change you?**")
+            ep['losses'] = st.text_area("Losses", value=ep.get('losses', ''), key="ep_losses_input", height=100)
+            
+            st.markdown("**What are your proudest moments? Times when you felt truly alive?**")
+            ep['proud_moments'] = st.text_area("Proud moments", value=ep.get('proud_moments', ''), key="ep_proud_input", height=100)
+            
+            st.markdown("**What obstacles did you overcome that defined who you are?**")
+            ep['overcame'] = st.text_area("Obstacles overcome", value=ep.get('overcame', ''), key="ep_overcame_input", height=100)
+            
+            if st.form_submit_button("💾 Save Section", type="primary", use_container_width=True):
+                save_account_data_async(st.session_state.user_account)
+                st.success("Biographer's profile saved!")
     
     with st.expander("🌍 Life Philosophy & Wisdom", expanded=False):
-        st.markdown("**What life lessons would you want to pass on to future generations?**")
-        ep['life_lessons'] = st.text_area("Life lessons", value=ep.get('life_lessons', ''), key="ep_lessons_input", height=100)
-        
-        st.markdown("**What do you believe in? What are your core values?**")
-        ep['values'] = st.text_area("Core values", value=ep.get('values', ''), key="ep_values_input", height=100)
-        
-        st.markdown("**If you could give your younger self advice, what would it be?**")
-        ep['advice'] = st.text_area("Advice to younger self", value=ep.get('advice', ''), key="ep_advice_input", height=100)
-        
-        st.markdown("**How would you like to be remembered?**")
-        ep['legacy'] = st.text_area("Legacy", value=ep.get('legacy', ''), key="ep_legacy_input", height=100)
-    
-    if st.button("💾 Save Biographer's Questions", key="save_enhanced_profile_btn", type="primary", use_container_width=True):
-        save_account_data(st.session_state.user_account)
-        st.success("Biographer's profile saved!")
-        st.rerun()
+        with st.form("ep_section_form_6"):
+            st.markdown("**What life lessons would you want to pass on to future generations?**")
+            ep['life_lessons'] = st.text_area("Life lessons", value=ep.get('life_lessons', ''), key="ep_lessons_input", height=100)
+            
+            st.markdown("**What do you believe in? What are your core values?**")
+            ep['values'] = st.text_area("Core values", value=ep.get('values', ''), key="ep_values_input", height=100)
+            
+            st.markdown("**If you could give your younger self advice, what would it be?**")
+            ep['advice'] = st.text_area("Advice to younger self", value=ep.get('advice', ''), key="ep_advice_input", height=100)
+            
+            st.markdown("**How would you like to be remembered?**")
+            ep['legacy'] = st.text_area("Legacy", value=ep.get('legacy', ''), key="ep_legacy_input", height=100)
+            
+            if st.form_submit_button("💾 Save Section", type="primary", use_container_width=True):
+                save_account_data_async(st.session_state.user_account)
+                st.success("Biographer's profile saved!")
 
 # ============================================================================
 # NARRATIVE GPS PROFILE SECTION
 # ============================================================================
-def render_narrative_gps():
-    st.markdown("### ❤️ The Heart of Your Story")
-    
-    st.markdown("""
-    <div class="narrative-gps-box">
-    <p>Your answers to these questions help me support you properly throughout the process and make sure the finished book is exactly right for you and your readers.</p>
-    
-    <p>The more open and detailed you are here, the easier it is for your real voice and personality to come through on every page. Think of this as a conversation between you and the person who will read your story one day — and I'm here alongside you, listening, capturing what matters, and helping shape it into something lasting.</p>
-    
-    <p><strong>There's no rush.</strong> You can return and add to this whenever new thoughts or memories surface. This is where your story truly begins.</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    if 'narrative_gps' not in st.session_state.user_account:
-        st.session_state.user_account['narrative_gps'] = {}
-    
-    gps = st.session_state.user_account['narrative_gps']
-    
+_GENRE_OPTIONS = ("", "Memoir", "Autobiography", "Family History", "Business/Legacy Book", "Other")
+_GENRE_INDEX = {v: i for i, v in enumerate(_GENRE_OPTIONS)}
+
+_LENGTH_OPTIONS = ("", "A short book (100-150 pages)", "Standard length (200-300 pages)", "Comprehensive (300+ pages)")
+_LENGTH_INDEX = {v: i for i, v in enumerate(_LENGTH_OPTIONS)}
+
+_COMPLETION_OPTIONS = ("", "Notes only", "Partial chapters", "Full draft")
+_COMPLETION_INDEX = {v: i for i, v in enumerate(_COMPLETION_OPTIONS)}
+
+_LANGUAGE_OPTIONS = ("", "Simple, everyday language", "Rich, descriptive prose", "Short, punchy chapters", "Long, flowing narratives")
+_LANGUAGE_INDEX = {v: i for i, v in enumerate(_LANGUAGE_OPTIONS)}
+
+_TIME_OPTIONS = ("", "Your entire life", "A specific era/decade", "One defining experience", "Your career/business journey")
+_TIME_INDEX = {v: i for i, v in enumerate(_TIME_OPTIONS)}
+
+_INVOLVEMENT_OPTIONS = (
+    "I'll answer questions, you write everything",
+    "I'll write drafts, you polish",
+    "We'll interview together, then you write",
+    "Mixed approach: [explain]"
+)
+_INVOLVEMENT_INDEX = {v: i for i, v in enumerate(_INVOLVEMENT_OPTIONS)}
+
+_FEEDBACK_OPTIONS = ("", "Written comments", "Phone/video discussions", "Line-by-line edits")
+_FEEDBACK_INDEX = {v: i for i, v in enumerate(_FEEDBACK_OPTIONS)}
+
+_PURPOSE_OPTIONS = (
+    "Leave a legacy for family/future generations",
+    "Share life lessons to help others",
+    "Document professional/business journey",
+    "Heal or process through writing",
+    "Establish authority/expertise",
+    "Entertain with entertaining stories"
+)
+
+_VOICE_OPTIONS = (
+    "Warm and conversational (like talking to a friend)",
+    "Professional and authoritative",
+    "Raw and vulnerable",
+    "Humorous/lighthearted",
+    "Philosophical/reflective"
+)
+
+_INCLUSION_OPTIONS = ("Photos", "Family trees", "Recipes", "Letters/documents", "Timelines", "Resources for readers")
+
+_MATERIAL_OPTIONS = (
+    "Journals/diaries", "Letters or emails", "Photos (with dates/context)",
+    "Video/audio recordings", "Newspaper clippings", "Awards/certificates",
+    "Social media posts", "Previous interviews"
+)
+
+_LEGAL_OPTIONS = ("ISBN registration", "Copyright", "Libel review", "Permissions for quoted material")
+
+def _multiselect_into(gps, field, options, label, key):
+    """Edit a list-of-options field of gps with one multiselect, keeping option order"""
+    chosen = set(gps.get(field, []))
+    gps[field] = st.multiselect(
+        label,
+        options=options,
+        default=[opt for opt in options if opt in chosen],
+        label_visibility="collapsed",
+        key=key
+    )
+
+def _save_gps_section(gps):
+    gps['_v'] = gps.get('_v', 0) + 1
+    save_account_data_async(st.session_state.user_account)
+    st.success("✅ The Heart of Your Story saved!")
+
+@st.fragment
+def _gps_project_scope(gps):
     with st.expander("📖 Section 1: The Book Itself (Project Scope)", expanded=True):
-        st.markdown("**BOOK TITLE (Working or Final):**")
-        gps['book_title'] = st.text_input(
-            "What's your working title? If unsure, what feeling or idea should the title convey?",
-            value=gps.get('book_title', ''),
-            label_visibility="collapsed",
-            placeholder="What's your working title? If unsure, what feeling or idea should the title convey?",
-            key="gps_title_input"
-        )
-        
-        st.markdown("**BOOK GENRE/CATEGORY:**")
-        genre_options = ["", "Memoir", "Autobiography", "Family History", "Business/Legacy Book", "Other"]
-        genre_index = 0
-        if gps.get('genre') in genre_options:
-            genre_index = genre_options.index(gps['genre'])
-        
-        gps['genre'] = st.selectbox(
-            "BOOK GENRE/CATEGORY:",
-            options=genre_options,
-            index=genre_index,
-            label_visibility="collapsed",
-            key="gps_genre_select"
-        )
-        if gps['genre'] == "Other":
-            gps['genre_other'] = st.text_input("Please specify:", value=gps.get('genre_other', ''), key="gps_genre_other_input")
-        
-        st.markdown("**BOOK LENGTH VISION:**")
-        length_options = ["", "A short book (100-150 pages)", "Standard length (200-300 pages)", "Comprehensive (300+ pages)"]
-        length_index = 0
-        if gps.get('book_length') in length_options:
-            length_index = length_options.index(gps['book_length'])
-        
-        gps['book_length'] = st.selectbox(
-            "BOOK LENGTH VISION:",
-            options=length_options,
-            index=length_index,
-            label_visibility="collapsed",
-            key="gps_length_select"
-        )
-        
-        st.markdown("**TIMELINE & DEADLINES:**")
-        gps['timeline'] = st.text_area(
-            "Do you have a target publication date or event this book is tied to? (e.g., birthday, retirement, anniversary)",
-            value=gps.get('timeline', ''),
-            label_visibility="collapsed",
-            placeholder="Do you have a target publication date or event this book is tied to? (e.g., birthday, retirement, anniversary)",
-            key="gps_timeline_input"
-        )
-        
-        st.markdown("**COMPLETION STATUS:**")
-        completion_options = ["", "Notes only", "Partial chapters", "Full draft"]
-        completion_index = 0
-        if gps.get('completion_status') in completion_options:
-            completion_index = completion_options.index(gps['completion_status'])
-        
-        gps['completion_status'] = st.selectbox(
-            "COMPLETION STATUS:",
-            options=completion_options,
-            index=completion_index,
-            label_visibility="collapsed",
-            key="gps_completion_select"
-        )
-    
+        with st.form("gps_section_form_1"):
+            st.markdown("**BOOK TITLE (Working or Final):**")
+            gps['book_title'] = st.text_input(
+                "What's your working title? If unsure, what feeling or idea should the title convey?",
+                value=gps.get('book_title', ''),
+                label_visibility="collapsed",
+                placeholder="What's your working title? If unsure, what feeling or idea should the title convey?",
+                key="gps_title_input"
+            )
+            
+            st.markdown("**BOOK GENRE/CATEGORY:**")
+            genre_index = _GENRE_INDEX.get(gps.get('genre'), 0)
+            
+            gps['genre'] = st.selectbox(
+                "BOOK GENRE/CATEGORY:",
+                options=_GENRE_OPTIONS,
+                index=genre_index,
+                label_visibility="collapsed",
+                key="gps_genre_select"
+            )
+            # Always shown: inside a form the selectbox value only updates on submit
+            gps['genre_other'] = st.text_input(
+                "If Other, please specify:",
+                value=gps.get('genre_other', ''),
+                help="Only used when the genre is set to Other",
+                key="gps_genre_other_input"
+            )
+            
+            st.markdown("**BOOK LENGTH VISION:**")
+            length_index = _LENGTH_INDEX.get(gps.get('book_length'), 0)
+            
+            gps['book_length'] = st.selectbox(
+                "BOOK LENGTH VISION:",
+                options=_LENGTH_OPTIONS,
+                index=length_index,
+                label_visibility="collapsed",
+                key="gps_length_select"
+            )
+            
+            st.markdown("**TIMELINE & DEADLINES:**")
+            gps['timeline'] = st.text_area(
+                "Do you have a target publication date or event this book is tied to? (e.g., birthday, retirement, anniversary)",
+                value=gps.get('timeline', ''),
+                label_visibility="collapsed",
+                placeholder="Do you have a target publication date or event this book is tied to? (e.g., birthday, retirement, anniversary)",
+                key="gps_timeline_input"
+            )
+            
+            st.markdown("**COMPLETION STATUS:**")
+            completion_index = _COMPLETION_INDEX.get(gps.get('completion_status'), 0)
+            
+            gps['completion_status'] = st.selectbox(
+                "COMPLETION STATUS:",
+                options=_COMPLETION_OPTIONS,
+                index=completion_index,
+                label_visibility="collapsed",
+                key="gps_completion_select"
+            )
+            
+            if st.form_submit_button("💾 Save Section", type="primary", use_container_width=True):
+                _save_gps_section(gps)
+
+@st.fragment
+def _gps_purpose_audience(gps):
     with st.expander("🎯 Section 2: Purpose & Audience (The 'Why')", expanded=False):
-        st.markdown("**THE CORE PURPOSE (Choose all that apply):**")
-        
-        if 'purposes' not in gps:
-            gps['purposes'] = []
-        
-        purposes_options = [
-            "Leave a legacy for family/future generations",
-            "Share life lessons to help others",
-            "Document professional/business journey",
-            "Heal or process through writing",
-            "Establish authority/expertise",
-            "Entertain with entertaining stories"
-        ]
-        
-        for purpose in purposes_options:
-            if st.checkbox(
-                purpose,
-                value=purpose in gps.get('purposes', []),
-                key=f"gps_purpose_{purpose.replace(' ', '_')}"
-            ):
-                if purpose not in gps['purposes']:
-                    gps['purposes'].append(purpose)
-            else:
-                if purpose in gps['purposes']:
-                    gps['purposes'].remove(purpose)
-        
-        gps['purpose_other'] = st.text_input("Other:", value=gps.get('purpose_other', ''), key="gps_purpose_other_input")
-        
-        st.markdown("---")
-        st.markdown("**PRIMARY AUDIENCE:**")
-        st.markdown("*Who is your ideal reader? Be specific:*")
-        
-        gps['audience_family'] = st.text_input(
-            "Family members (which generations?):",
-            value=gps.get('audience_family', ''),
-            key="gps_audience_family_input"
-        )
-        
-        gps['audience_industry'] = st.text_input(
-            "People in your industry/profession:",
-            value=gps.get('audience_industry', ''),
-            key="gps_audience_industry_input"
-        )
-        
-        gps['audience_challenges'] = st.text_input(
-            "People facing similar challenges you overcame:",
-            value=gps.get('audience_challenges', ''),
-            key="gps_audience_challenges_input"
-        )
-        
-        gps['audience_general'] = st.text_input(
-            "The general public interested in:",
-            value=gps.get('audience_general', ''),
-            placeholder="your topic",
-            key="gps_audience_general_input"
-        )
-        
-        st.markdown("---")
-        st.markdown("**THE READER TAKEAWAY:**")
-        gps['reader_takeaway'] = st.text_area(
-            "What do you want readers to feel, think, or do after finishing your book?",
-            value=gps.get('reader_takeaway', ''),
-            label_visibility="collapsed",
-            placeholder="What do you want readers to feel, think, or do after finishing your book?",
-            key="gps_takeaway_input"
-        )
-    
+        with st.form("gps_section_form_2"):
+            st.markdown("**THE CORE PURPOSE (Choose all that apply):**")
+            
+            _multiselect_into(gps, 'purposes', _PURPOSE_OPTIONS, "Core purposes:", "gps_purpose_multiselect")
+            
+            gps['purpose_other'] = st.text_input("Other:", value=gps.get('purpose_other', ''), key="gps_purpose_other_input")
+            
+            st.markdown("---")
+            st.markdown("**PRIMARY AUDIENCE:**")
+            st.markdown("*Who is your ideal reader? Be specific:*")
+            
+            gps['audience_family'] = st.text_input(
+                "Family members (which generations?):",
+                value=gps.get('audience_family', ''),
+                key="gps_audience_family_input"
+            )
+            
+            gps['audience_industry'] = st.text_input(
+                "People in your industry/profession:",
+                value=gps.get('audience_industry', ''),
+                key="gps_audience_industry_input"
+            )
+            
+            gps['audience_challenges'] = st.text_input(
+                "People facing similar challenges you overcame:",
+                value=gps.get('audience_challenges', ''),
+                key="gps_audience_challenges_input"
+            )
+            
+            gps['audience_general'] = st.text_input(
+                "The general public interested in:",
+                value=gps.get('audience_general', ''),
+                placeholder="your topic",
+                key="gps_audience_general_input"
+            )
+            
+            st.markdown("---")
+            st.markdown("**THE READER TAKEAWAY:**")
+            gps['reader_takeaway'] = st.text_area(
+                "What do you want readers to feel, think, or do after finishing your book?",
+                value=gps.get('reader_takeaway', ''),
+                label_visibility="collapsed",
+                placeholder="What do you want readers to feel, think, or do after finishing your book?",
+                key="gps_takeaway_input"
+            )
+            
+            if st.form_submit_button("💾 Save Section", type="primary", use_container_width=True):
+                _save_gps_section(gps)
+
+@st.fragment
+def _gps_tone_voice(gps):
     with st.expander("🎭 Section 3: Tone & Voice (The 'How')", expanded=False):
-        st.markdown("**NARRATIVE VOICE:**")
-        
-        if 'narrative_voices' not in gps:
-            gps['narrative_voices'] = []
-        
-        voice_options = [
-            "Warm and conversational (like talking to a friend)",
-            "Professional and authoritative",
-            "Raw and vulnerable",
-            "Humorous/lighthearted",
-            "Philosophical/reflective"
-        ]
-        
-        for voice in voice_options:
-            if st.checkbox(
-                voice,
-                value=voice in gps.get('narrative_voices', []),
-                key=f"gps_voice_{voice.replace(' ', '_')}"
-            ):
-                if voice not in gps['narrative_voices']:
-                    gps['narrative_voices'].append(voice)
-            else:
-                if voice in gps['narrative_voices']:
-                    gps['narrative_voices'].remove(voice)
-        
-        gps['voice_other'] = st.text_input("Other:", value=gps.get('voice_other', ''), key="gps_voice_other_input")
-        
-        st.markdown("---")
-        st.markdown("**EMOTIONAL TONE:**")
-        gps['emotional_tone'] = st.text_area(
-            "Should readers laugh? Cry? Feel inspired? Get angry? All of the above?",
-            value=gps.get('emotional_tone', ''),
-            label_visibility="collapsed",
-            placeholder="Should readers laugh? Cry? Feel inspired? Get angry? All of the above?",
-            key="gps_emotional_input"
-        )
-        
-        st.markdown("---")
-        st.markdown("**LANGUAGE STYLE:**")
-        language_options = ["", "Simple, everyday language", "Rich, descriptive prose", "Short, punchy chapters", "Long, flowing narratives"]
-        language_index = 0
-        if gps.get('language_style') in language_options:
-            language_index = language_options.index(gps['language_style'])
-        
-        gps['language_style'] = st.selectbox(
-            "LANGUAGE STYLE:",
-            options=language_options,
-            index=language_index,
-            label_visibility="collapsed",
-            key="gps_language_select"
-        )
-    
+        with st.form("gps_section_form_3"):
+            st.markdown("**NARRATIVE VOICE:**")
+            
+            _multiselect_into(gps, 'narrative_voices', _VOICE_OPTIONS, "Narrative voice:", "gps_voice_multiselect")
+            
+            gps['voice_other'] = st.text_input("Other:", value=gps.get('voice_other', ''), key="gps_voice_other_input")
+            
+            st.markdown("---")
+            st.markdown("**EMOTIONAL TONE:**")
+            gps['emotional_tone'] = st.text_area(
+                "Should readers laugh? Cry? Feel inspired? Get angry? All of the above?",
+                value=gps.get('emotional_tone', ''),
+                label_visibility="collapsed",
+                placeholder="Should readers laugh? Cry? Feel inspired? Get angry? All of the above?",
+                key="gps_emotional_input"
+            )
+            
+            st.markdown("---")
+            st.markdown("**LANGUAGE STYLE:**")
+            language_index = _LANGUAGE_INDEX.get(gps.get('language_style'), 0)
+            
+            gps['language_style'] = st.selectbox(
+                "LANGUAGE STYLE:",
+                options=_LANGUAGE_OPTIONS,
+                index=language_index,
+                label_visibility="collapsed",
+                key="gps_language_select"
+            )
+            
+            if st.form_submit_button("💾 Save Section", type="primary", use_container_width=True):
+                _save_gps_section(gps)
+
+@st.fragment
+def _gps_content_parameters(gps):
     with st.expander("📋 Section 4: Content Parameters (The 'What')", expanded=False):
-        st.markdown("**TIME COVERAGE:**")
-        time_options = ["", "Your entire life", "A specific era/decade", "One defining experience", "Your career/business journey"]
-        time_index = 0
-        if gps.get('time_coverage') in time_options:
-            time_index = time_options.index(gps['time_coverage'])
-        
-        gps['time_coverage'] = st.selectbox(
-            "TIME COVERAGE:",
-            options=time_options,
-            index=time_index,
-            label_visibility="collapsed",
-            key="gps_time_select"
-        )
-        
-        st.markdown("---")
-        st.markdown("**SENSITIVE MATERIAL:**")
-        gps['sensitive_material'] = st.text_area(
-            "Are there topics, people, or events you want to handle carefully or omit entirely?",
-            value=gps.get('sensitive_material', ''),
-            label_visibility="collapsed",
-            placeholder="Are there topics, people, or events you want to handle carefully or omit entirely?",
-            key="gps_sensitive_input"
-        )
-        
-        gps['sensitive_people'] = st.text_area(
-            "Any living people whose portrayal requires sensitivity or legal consideration?",
-            value=gps.get('sensitive_people', ''),
-            label_visibility="collapsed",
-            placeholder="Any living people whose portrayal requires sensitivity or legal consideration?",
-            key="gps_sensitive_people_input"
-        )
-        
-        st.markdown("---")
-        st.markdown("**INCLUSIONS:**")
-        
-        if 'inclusions' not in gps:
-            gps['inclusions'] = []
-        
-        inclusion_options = ["Photos", "Family trees", "Recipes", "Letters/documents", "Timelines", "Resources for readers"]
-        for inc in inclusion_options:
-            if st.checkbox(
-                inc,
-                value=inc in gps.get('inclusions', []),
-                key=f"gps_inc_{inc.replace(' ', '_')}"
-            ):
-                if inc not in gps['inclusions']:
-                    gps['inclusions'].append(inc)
-            else:
-                if inc in gps['inclusions']:
-                    gps['inclusions'].remove(inc)
-        
-        st.markdown("---")
-        st.markdown("**LOCATIONS:**")
-        gps['locations'] = st.text_area(
-            "List key places that must appear in the story (hometowns, meaningful travels, etc.)",
-            value=gps.get('locations', ''),
-            label_visibility="collapsed",
-            placeholder="List key places that must appear in the story (hometowns, meaningful travels, etc.)",
-            key="gps_locations_input"
-        )
-    
-    with st.expander("📦 Section 5: Assets & Access (The 'Resources')", expanded=False):
-        st.markdown("**EXISTING MATERIALS:**")
-        
-        if 'materials' not in gps:
-            gps['materials'] = []
-        
-        material_options = [
-            "Journals/diaries", "Letters or emails", "Photos (with dates/context)",
-            "Video/audio recordings", "Newspaper clippings", "Awards/certificates",
-            "Social media posts", "Previous interviews"
-        ]
-        
-        for mat in material_options:
-            if st.checkbox(
-                mat,
-                value=mat in gps.get('materials', []),
-                key=f"gps_mat_{mat.replace(' ', '_')}"
-            ):
-                if mat not in gps['materials']:
-                    gps['materials'].append(mat)
-            else:
-                if mat in gps['materials']:
-                    gps['materials'].remove(mat)
-        
-        st.markdown("---")
-        st.markdown("**PEOPLE TO INTERVIEW:**")
-        gps['people_to_interview'] = st.text_area(
-            "Are there family members, friends, or colleagues who should contribute their memories?",
-            value=gps.get('people_to_interview', ''),
-            label_visibility="collapsed",
-            placeholder="Are there family members, friends, or colleagues who should contribute their memories?",
-            key="gps_people_input"
-        )
-        
-        st.markdown("---")
-        st.markdown("**FINANCIAL & LEGAL:**")
-        
-        if 'legal' not in gps:
-            gps['legal'] = []
-        
-        legal_options = ["ISBN registration", "Copyright", "Libel review", "Permissions for quoted material"]
-        for leg in legal_options:
-            if st.checkbox(
-                leg,
-                value=leg in gps.get('legal', []),
-                key=f"gps_legal_{leg.replace(' ', '_')}"
-            ):
-                if leg not in gps['legal']:
-                    gps['legal'].append(leg)
-            else:
-                if leg in gps['legal']:
-                    gps['legal'].remove(leg)
-    
+        with st.form("gps_section_form_4"):
+            st.markdown("**TIME COVERAGE:**")
+            time_index = _TIME_INDEX.get(gps.get('time_coverage'), 0)
+            
+            gps['time_coverage'] = st.selectbox(
+                "TIME COVERAGE:",
+                options=_TIME_OPTIONS,
+                index=time_index,
+                label_visibility="collapsed",
+                key="gps_time_select"
+            )
+            
+            st.markdown("---")
+            st.markdown("**SENSITIVE MATERIAL:**")
+            gps['sensitive_material'] = st.text_area(
+                "Are there topics, people, or events you want to handle carefully or omit entirely?",
+                value=gps.get('sensitive_material', ''),
+                label_visibility="collapsed",
+                placeholder="Are there topics, people, or events you want to handle carefully or omit entirely?",
+                key="gps_sensitive_input"
+            )
+            
+            gps['sensitive_people'] = st.text_area(
+                "Any living people whose portrayal requires sensitivity or legal consideration?",
+                value=gps.get('sensitive_people', ''),
+                label_visibility="collapsed",
+                placeholder="Any living people whose portrayal requires sensitivity or legal consideration?",
+                key="gps_sensitive_people_input"
+            )
+            
+            st.markdown("---")
+            st.markdown("**INCLUSIONS:**")
+            
+            _multiselect_into(gps, 'inclusions', _INCLUSION_OPTIONS, "Inclusions:", "gps_inc_multiselect")
+            
+            st.markdown("---")
+            st.markdown("**LOCATIONS:**")
+            gps['locations'] = st.text_area(
+                "List key places that must appear in the story (hometowns, meaningful travels, etc.)",
+                value=gps.get('locations', ''),
+                label_visibility="collapsed",
+                placeholder="List key places that must appear in the story (hometowns, meaningful travels, etc.)",
+                key="gps_locations_input"
+            )
+            
+            if st.form_submit_button("💾 Save Section", type="primary", use_container_width=True):
+                _save_gps_section(gps)
+
+@st.fragment
+def _gps_assets_access(gps):
+    with st.expander("📦 Section 5: Assets & Access (The 'Resources')", expanded=False):
+        with st.form("gps_section_form_5"):
+            st.markdown("**EXISTING MATERIALS:**")
+            
+            _multiselect_into(gps, 'materials', _MATERIAL_OPTIONS, "Existing materials:", "gps_mat_multiselect")
+            
+            st.markdown("---")
+            st.markdown("**PEOPLE TO INTERVIEW:**")
+            gps['people_to_interview'] = st.text_area(
+                "Are there family members, friends, or colleagues who should contribute their memories?",
+                value=gps.get('people_to_interview', ''),
+                label_visibility="collapsed",
+                placeholder="Are there family members, friends, or colleagues who should contribute their memories?",
+                key="gps_people_input"
+            )
+            
+            st.markdown("---")
+            st.markdown("**FINANCIAL & LEGAL:**")
+            
+            _multiselect_into(gps, 'legal', _LEGAL_OPTIONS, "Financial & legal:", "gps_legal_multiselect")
+            
+            if st.form_submit_button("💾 Save Section", type="primary", use_container_width=True):
+                _save_gps_section(gps)
+
+@st.fragment
+def _gps_collaboration(gps):
     with st.expander("🤝 Section 6: Ghostwriter Relationship (The 'Collaboration')", expanded=False):
-        st.markdown("**YOUR INVOLVEMENT:**")
-        
-        involvement_options = [
-            "I'll answer questions, you write everything",
-            "I'll write drafts, you polish",
-            "We'll interview together, then you write",
-            "Mixed approach: [explain]"
-        ]
-        
-        involvement_index = 0
-        if gps.get('involvement') in involvement_options:
-            involvement_index = involvement_options.index(gps['involvement'])
-        
-        gps['involvement'] = st.radio(
-            "How do you want to work together?",
-            options=involvement_options,
-            index=involvement_index,
-            key="gps_involvement_radio"
-        )
-        
-        if gps.get('involvement') == "Mixed approach: [explain]":
+        with st.form("gps_section_form_6"):
+            st.markdown("**YOUR INVOLVEMENT:**")
+            
+            involvement_index = _INVOLVEMENT_INDEX.get(gps.get('involvement'), 0)
+            
+            gps['involvement'] = st.radio(
+                "How do you want to work together?",
+                options=_INVOLVEMENT_OPTIONS,
+                index=involvement_index,
+                key="gps_involvement_radio"
+            )
+            
+            # Always shown: inside a form the radio value only updates on submit
             gps['involvement_explain'] = st.text_area(
-                "Explain your preferred approach:",
+                "If mixed approach, explain your preferred approach:",
                 value=gps.get('involvement_explain', ''),
+                help="Only used when the mixed approach is selected",
                 key="gps_involvement_explain_input"
             )
-        
-        st.markdown("---")
-        
-        st.markdown("**FEEDBACK STYLE:**")
-        feedback_options = ["", "Written comments", "Phone/video discussions", "Line-by-line edits"]
-        feedback_index = 0
-        if gps.get('feedback_style') in feedback_options:
-            feedback_index = feedback_options.index(gps['feedback_style'])
-        
-        gps['feedback_style'] = st.selectbox(
-            "FEEDBACK STYLE:",
-            options=feedback_options,
-            index=feedback_index,
-            label_visibility="collapsed",
-            key="gps_feedback_select"
-        )
-        
-        st.markdown("---")
-        st.markdown("**THE UNSPOKEN:**")
-        gps['unspoken'] = st.text_area(
-            "What are you hoping I'll bring to this project that you can't do yourself?",
-            value=gps.get('unspoken', ''),
-            label_visibility="collapsed",
-            placeholder="What are you hoping I'll bring to this project that you can't do yourself?",
-            key="gps_unspoken_input"
-        )
+            
+            st.markdown("---")
+            
+            st.markdown("**FEEDBACK STYLE:**")
+            feedback_index = _FEEDBACK_INDEX.get(gps.get('feedback_style'), 0)
+            
+            gps['feedback_style'] = st.selectbox(
+                "FEEDBACK STYLE:",
+                options=_FEEDBACK_OPTIONS,
+                index=feedback_index,
+                label_visibility="collapsed",
+                key="gps_feedback_select"
+            )
+            
+            st.markdown("---")
+            st.markdown("**THE UNSPOKEN:**")
+            gps['unspoken'] = st.text_area(
+                "What are you hoping I'll bring to this project that you can't do yourself?",
+                value=gps.get('unspoken', ''),
+                label_visibility="collapsed",
+                placeholder="What are you hoping I'll bring to this project that you can't do yourself?",
+                key="gps_unspoken_input"
+            )
+            
+            if st.form_submit_button("💾 Save Section", type="primary", use_container_width=True):
+                _save_gps_section(gps)
+
+def render_narrative_gps():
+    st.markdown("### ❤️ The Heart of Your Story")
     
-    if st.button("💾 Save The Heart of Your Story", key="save_narrative_gps_btn", type="primary", use_container_width=True):
-        save_account_data(st.session_state.user_account)
-        st.success("✅ The Heart of Your Story saved!")
-        st.rerun()
+    st.markdown("""
+    <div class="narrative-gps-box">
+    <p>Your answers to these questions help me support you properly throughout the process and make sure the finished book is exactly right for you and your readers.</p>
+    
+    <p>The more open and detailed you are here, the easier it is for your real voice and personality to come through on every page. Think of this as a conversation between you and the person who will read your story one day — and I'm here alongside you, listening, capturing what matters, and helping shape it into something lasting.</p>
+    
+    <p><strong>There's no rush.</strong> You can return and add to this whenever new thoughts or memories surface. This is where your story truly begins.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    if 'narrative_gps' not in st.session_state.user_account:
+        st.session_state.user_account['narrative_gps'] = {}
+    
+    gps = st.session_state.user_account['narrative_gps']
+    
+    _gps_project_scope(gps)
+    _gps_purpose_audience(gps)
+    _gps_tone_voice(gps)
+    _gps_content_parameters(gps)
+    _gps_assets_access(gps)
+    _gps_collaboration(gps)
 
 # ============================================================================
 # STORAGE FUNCTIONS
 # ============================================================================
+# Bound once for the storage helpers, which run several times per rerun
+_exists = os.path.exists
+_stat = os.stat
+_blake2b = hashlib.blake2b
+
+def user_bucket(user_id):
+    return _blake2b(user_id.encode(), digest_size=4).hexdigest()
+
 def get_user_filename(user_id):
-    return f"user_data_{hashlib.md5(user_id.encode()).hexdigest()[:8]}.json"
+    # Resolved once per session: avoids re-hashing and the legacy-file probe on every rerun
+    filenames = st.session_state.setdefault("_user_filenames", {})
+    if user_id in filenames:
+        return filenames[user_id]
+    filename = f"user_data_{user_bucket(user_id)}.json"
+    if not _exists(filename):
+        # Files created before the switch from md5 keep working: move them over on first use
+        legacy = f"user_data_{hashlib.md5(user_id.encode()).hexdigest()[:8]}.json"
+        if _exists(legacy):
+            try:
+                os.replace(legacy, filename)
+                logger.info(f"Migrated {legacy} to {filename}")
+            except OSError as e:
+                logger.error(f"Error migrating user data file: {e}")
+                return legacy
+    filenames[user_id] = filename
+    return filename
+
+def get_responses_dir(user_id):
+    return os.path.join("responses", user_bucket(user_id))
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def load_user_data_cached(fname, mtime_ns, size):
+    """Parsed user data or session file; mtime/size key the cache so any write (here or in BetaReader) reloads it"""
+    return read_json(fname)
+
+def load_response_shards(user_id):
+    """Sessions saved one file per session, keyed by session id string"""
+    shards = {}
+    try:
+        with os.scandir(get_responses_dir(user_id)) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    shards[entry.name[:-5]] = load_user_data_cached(entry.path, stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        pass
+    return shards
 
 def load_user_data(user_id):
     fname = get_user_filename(user_id)
     try:
-        if os.path.exists(fname):
-            with open(fname, 'r') as f:
-                return json.load(f)
-        return {"responses": {}, "vignettes": [], "last_loaded": datetime.now().isoformat()}
+        try:
+            stat = _stat(fname)
+            data = load_user_data_cached(fname, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            data = {"responses": {}, "vignettes": [], "last_loaded": datetime.now().isoformat()}
+        shards = load_response_shards(user_id)
+        if shards:
+            # Files written before sharding still carry their responses inline
+            data = {**data, "responses": {**data.get("responses", {}), **shards}}
+        return data
     except Exception as e:
         logger.error(f"Error loading user data: {e}")
         return {"responses": {}, "vignettes": [], "last_loaded": datetime.now().isoformat()}
 
-def save_user_data(user_id, responses_data):
+def changed_response_sessions(user_id, wanted):
+    """Saved sessions (ids in wanted) whose file changed since they were last returned this login"""
+    seen = st.session_state.setdefault("_hydrated_shards", {})
+    changed = {}
+    fname = get_user_filename(user_id)
+    if fname not in seen:
+        # Inline responses from the single-file layout only need reading once
+        seen[fname] = True
+        try:
+            stat = _stat(fname)
+            changed.update(load_user_data_cached(fname, stat.st_mtime_ns, stat.st_size).get("responses", {}))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error loading user data: {e}")
+    try:
+        with os.scandir(get_responses_dir(user_id)) as it:
+            for entry in it:
+                if not entry.name.endswith(".json") or entry.name[:-5] not in wanted or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                key = (stat.st_mtime_ns, stat.st_size)
+                if seen.get(entry.path) == key:
+                    continue
+                changed[entry.name[:-5]] = load_user_data_cached(entry.path, *key)
+                seen[entry.path] = key
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"Error loading session files: {e}")
+    return changed
+
+def save_user_data(user_id, responses_data, session_ids=None):
+    """Write each changed session to its own file, then the rest of the user data; session_ids limits which sessions are considered"""
     fname = get_user_filename(user_id)
     try:
-        existing = load_user_data(user_id)
+        try:
+            stat = _stat(fname)
+            existing = load_user_data_cached(fname, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            existing = {}
+        if existing.get("responses"):
+            # Still in the single-file layout: move every session out this time
+            session_ids = None
+        
+        saved_hashes = st.session_state.setdefault("_user_data_hashes", {})
+        shard_dir = get_responses_dir(user_id)
+        os.makedirs(shard_dir, exist_ok=True)
+        for sid in (responses_data if session_ids is None else session_ids):
+            if sid not in responses_data:
+                continue
+            path = os.path.join(shard_dir, f"{sid}.json")
+            payload = json_dumps_bytes(responses_data[sid])
+            digest = _blake2b(payload, digest_size=16).digest()
+            if saved_hashes.get(path) == digest and _exists(path):
+                continue
+            write_bytes_atomic(path, payload)
+            saved_hashes[path] = digest
+        
         data = {
             "user_id": user_id, 
-            "responses": responses_data,
             "vignettes": existing.get("vignettes", []),
             "beta_feedback": existing.get("beta_feedback", {}),
-            "vignette_beta_feedback": existing.get("vignette_beta_feedback", {}),
-            "last_saved": datetime.now().isoformat()
+            "vignette_beta_feedback": existing.get("vignette_beta_feedback", {})
         }
-        with open(fname, 'w') as f: 
-            json.dump(data, f, indent=2)
+        # Skip the write when nothing but the timestamp would change
+        digest = _blake2b(json_dumps_bytes(data), digest_size=16).digest()
+        if saved_hashes.get(fname) == digest and "responses" not in existing and _exists(fname):
+            return True
+        data["last_saved"] = datetime.now().isoformat()
+        write_json_atomic(fname, data)
+        saved_hashes[fname] = digest
         return True
     except Exception as e:
         logger.error(f"Error saving user data: {e}")
@@ -2451,19 +2841,29 @@ def save_response(session_id, question, answer):
         return False
     
     try:
-        text_only = re.sub(r'<[^>]+>', '', answer) if answer else ""
+        previous = st.session_state.responses.get(session_id, {}).get("questions", {}).get(question)
+        images = []
+        if st.session_state.image_handler:
+            images = st.session_state.image_handler.get_images_for_answer(session_id, question)
+        image_refs = [{"id": img["id"], "caption": img.get("caption", "")} for img in images]
+        if previous and previous.get("answer") == answer and previous.get("images", []) == image_refs:
+            # Nothing changed: no stats update, re-index or write
+            return True
+        
+        text_only = _TAG_RE.sub('', answer) if answer else ""
+        word_count = count_html_words(answer)
         
         if st.session_state.user_account:
-            word_count = len(re.findall(r'\w+', text_only))
-            st.session_state.user_account["stats"]["total_words"] = st.session_state.user_account["stats"].get("total_words", 0) + word_count
+            # Only the change in length counts towards the total, not the whole answer again
+            delta = word_count - (answer_word_count(previous) if previous else 0)
+            st.session_state.user_account["stats"]["total_words"] = max(0, st.session_state.user_account["stats"].get("total_words", 0) + delta)
             st.session_state.user_account["stats"]["last_active"] = datetime.now().isoformat()
             save_account_data(st.session_state.user_account)
             
             update_writing_streak(user_id)
         
         if session_id not in st.session_state.responses:
-            session_data = next((s for s in (st.session_state.current_question_bank or []) if s["id"] == session_id), 
-                              {"title": f"Session {session_id}", "word_target": DEFAULT_WORD_TARGET})
+            session_data = get_session_by_id(session_id) or {"title": f"Session {session_id}", "word_target": DEFAULT_WORD_TARGET}
             st.session_state.responses[session_id] = {
                 "title": session_data.get("title", f"Session {session_id}"),
                 "questions": {}, 
@@ -2472,24 +2872,22 @@ def save_response(session_id, question, answer):
                 "word_target": session_data.get("word_target", DEFAULT_WORD_TARGET)
             }
         
-        images = []
-        if st.session_state.image_handler:
-            images = st.session_state.image_handler.get_images_for_answer(session_id, question)
-        
         st.session_state.responses[session_id]["questions"][question] = {
             "answer": answer, 
+            "text_only": text_only,
+            "word_count": word_count,
             "question": question, 
             "timestamp": datetime.now().isoformat(),
             "answer_index": 1, 
-            "has_images": len(images) > 0 or ('<img' in answer),
+            "has_images": len(images) > 0 or (_IMG_TOKEN in answer),
             "image_count": len(images), 
-            "images": [{"id": img["id"], "caption": img.get("caption", "")} for img in images]
+            "images": image_refs
         }
+        index_answer(session_id, question, st.session_state.responses[session_id]["questions"][question])
         
-        success = save_user_data(user_id, st.session_state.responses)
-        if success: 
-            st.session_state.data_loaded = False
-        
+        # Every caller is an explicit user save, so write now; only the sessions marked dirty are rewritten
+        st.session_state.setdefault("_dirty_sessions", set()).add(session_id)
+        success = flush_user_data()
         logger.info(f"Response saved for user {user_id}, session {session_id}")
         return success
         
@@ -2497,6 +2895,18 @@ def save_response(session_id, question, answer):
         logger.error(f"Error saving response: {e}")
         return False
 
+def flush_user_data():
+    """Write sessions changed since the last successful write (e.g. after a failed save), if any"""
+    user_id = st.session_state.get("user_id")
+    dirty = st.session_state.get("_dirty_sessions")
+    if not user_id or not dirty:
+        return True
+    success = save_user_data(user_id, st.session_state.responses, session_ids=dirty)
+    if success:
+        dirty.clear()
+        st.session_state.data_loaded = False
+    return success
+
 def delete_response(session_id, question):
     user_id = st.session_state.user_id
     if not user_id: 
@@ -2505,7 +2915,8 @@ def delete_response(session_id, question):
     try:
         if session_id in st.session_state.responses and question in st.session_state.responses[session_id]["questions"]:
             del st.session_state.responses[session_id]["questions"][question]
-            success = save_user_data(user_id, st.session_state.responses)
+            index_answer(session_id, question, None)
+            success = save_user_data(user_id, st.session_state.responses, session_ids=[session_id])
             if success: 
                 st.session_state.data_loaded = False
             logger.info(f"Response deleted for user {user_id}, session {session_id}")
@@ -2515,23 +2926,41 @@ def delete_response(session_id, question):
         logger.error(f"Error deleting response: {e}")
         return False
 
+# Script-level, so it starts empty on every rerun; saves and deletes within a run bump responses_version
+_session_word_counts = {}
+_session_answer_counts = {}
+
+def get_answer_counts():
+    """Answered-question count per session of the current bank, built once per run (and responses_version)"""
+    bank = st.session_state.get("current_question_bank") or []
+    key = (st.session_state.get("responses_version", 0), id(bank))
+    counts = _session_answer_counts.get(key)
+    if counts is None:
+        responses = st.session_state.responses
+        counts = _session_answer_counts[key] = {s["id"]: len(responses.get(s["id"], {}).get("questions", {})) for s in bank}
+    return counts
+
 def calculate_author_word_count(session_id):
+    key = (session_id, st.session_state.get("responses_version", 0))
+    if key in _session_word_counts:
+        return _session_word_counts[key]
     total = 0
     try:
         if session_id in st.session_state.responses:
             for q, d in st.session_state.responses[session_id].get("questions", {}).items():
                 if d.get("answer"): 
-                    text_only = re.sub(r'<[^>]+>', '', d["answer"])
-                    total += len(re.findall(r'\w+', text_only))
+                    total += answer_word_count(d)
     except Exception as e:
         logger.error(f"Error calculating word count: {e}")
+        return total
+    _session_word_counts[key] = total
     return total
 
 def get_progress_info(session_id):
     try:
         current = calculate_author_word_count(session_id)
         if session_id not in st.session_state.responses:
-            session_data = next((s for s in (st.session_state.current_question_bank or []) if s["id"] == session_id), {})
+            session_data = get_session_by_id(session_id) or {}
             st.session_state.responses[session_id] = {
                 "title": session_data.get("title", f"Session {session_id}"),
                 "questions": {}, 
@@ -2563,12 +2992,42 @@ def get_progress_info(session_id):
             "status_text": "Error calculating progress"
         }
 
+# Each entry embeds every image as base64, so keep few and let them expire
+@st.cache_data(max_entries=2, ttl=600, show_spinner=False)
+def build_export_data(user_id, export_sig, _export_sessions, _image_handler):
+    """Stories with their images encoded for export; export_sig (a hash of _export_sessions) keys the cache"""
+    export_data = []
+    for sid, title, questions in _export_sessions:
+        for q, a in questions.items():
+            images_with_data = []
+            if a.get("images"):
+                for img_ref in a.get("images", []):
+                    img_id = img_ref.get("id")
+                    b64 = _image_handler.get_image_base64(img_id) if _image_handler else None
+                    caption = img_ref.get("caption", "")
+                    if b64:
+                        images_with_data.append({
+                            "id": img_id, "base64": b64, "caption": caption
+                        })
+            
+            export_data.append({
+                "question": q, 
+                "answer_text": answer_text(a),
+                "timestamp": a.get("timestamp", ""), 
+                "session_id": sid, 
+                "session_title": title,
+                "has_images": a.get("has_images", False), 
+                "image_count": a.get("image_count", 0),
+                "images": images_with_data
+            })
+    return export_data
+
 def auto_correct_text(text):
     if not text or not client: 
         return text
     
     try:
-        text_only = re.sub(r'<[^>]+>', '', text)
+        text_only = strip_html(text)
         resp = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
@@ -2583,9 +3042,139 @@ def auto_correct_text(text):
         logger.error(f"Error in spell check: {e}")
         return text
 
+def spell_check_paragraphs(content):
+    """Spell-check an answer one paragraph at a time, reusing results for paragraphs that haven't changed"""
+    cache = st.session_state.setdefault(f"spell_cache_{st.session_state.user_id}", {})
+    originals, keys, missing = [], [], {}
+    for para in content.split('</p>'):
+        text_only = strip_html(para).strip()
+        if not text_only:
+            continue
+        key = hashlib.sha1(text_only.encode()).hexdigest()
+        if key not in cache:
+            missing[key] = text_only
+        originals.append(text_only)
+        keys.append(key)
+    if missing:
+        # Uncached paragraphs are independent requests, so send them concurrently over the pooled client
+        with ThreadPoolExecutor(max_workers=min(len(missing), 8)) as executor:
+            cache.update(zip(missing, executor.map(auto_correct_text, missing.values())))
+    return originals, [cache[key] for key in keys]
+
 # ============================================================================
 # SEARCH FUNCTIONALITY
 # ============================================================================
+def get_search_index():
+    """Inverted index over answers: term -> {(session_id, question)}, plus per-document terms and lowercased text"""
+    index = st.session_state.get("search_index")
+    if index is None:
+        index = st.session_state.search_index = {"terms": {}, "docs": {}, "lookup": None}
+    return index
+
+def _unindex_answer(index, doc):
+    entry = index["docs"].pop(doc, None)
+    if not entry:
+        return
+    st.session_state.responses_version = st.session_state.get("responses_version", 0) + 1
+    for term in entry[1]:
+        postings = index["terms"].get(term)
+        if postings:
+            postings.discard(doc)
+            if not postings:
+                del index["terms"][term]
+                index["lookup"] = None
+
+def index_answer(session_id, question, answer_data):
+    """(Re)index one answer; answer_data=None removes it"""
+    index = get_search_index()
+    doc = (session_id, question)
+    _unindex_answer(index, doc)
+    if answer_data is None:
+        return
+    html_answer = answer_data.get("answer", "")
+    text_lower = answer_text(answer_data).lower()
+    question_lower = question.lower()
+    terms = frozenset(_WORD_RE.findall(text_lower)) | frozenset(_WORD_RE.findall(question_lower))
+    index["docs"][doc] = ((answer_data.get("timestamp"), len(html_answer)), terms, text_lower, question_lower)
+    st.session_state.responses_version = st.session_state.get("responses_version", 0) + 1
+    for term in terms:
+        postings = index["terms"].get(term)
+        if postings is None:
+            postings = index["terms"][term] = set()
+            index["lookup"] = None
+        postings.add(doc)
+
+def sync_search_index():
+    """Reindex only answers whose timestamp/length changed since they were indexed"""
+    index = get_search_index()
+    seen = set()
+    for session_id, session_data in st.session_state.responses.items():
+        for question, answer_data in session_data.get("questions", {}).items():
+            doc = (session_id, question)
+            seen.add(doc)
+            entry = index["docs"].get(doc)
+            if not entry or entry[0] != (answer_data.get("timestamp"), len(answer_data.get("answer", ""))):
+                index_answer(session_id, question, answer_data)
+    for doc in [d for d in index["docs"] if d not in seen]:
+        _unindex_answer(index, doc)
+    return index
+
+def _term_lookup(index):
+    """Sorted terms, sorted reversed terms and trigram -> terms; rebuilt only after the vocabulary changes"""
+    lookup = index.get("lookup")
+    if lookup is None:
+        terms = sorted(index["terms"])
+        grams = {}
+        for term in terms:
+            for i in range(len(term) - 2):
+                grams.setdefault(term[i:i + 3], set()).add(term)
+        lookup = index["lookup"] = (terms, sorted(t[::-1] for t in terms), grams)
+    return lookup
+
+def _prefixed(sorted_terms, prefix):
+    i = bisect_left(sorted_terms, prefix)
+    while i < len(sorted_terms) and sorted_terms[i].startswith(prefix):
+        yield sorted_terms[i]
+        i += 1
+
+def _search_candidates(index, search_query):
+    """Documents that could contain search_query, or None when the query has no word characters"""
+    tokens = _WORD_RE.findall(search_query)
+    if not tokens:
+        return None
+    terms_index = index["terms"]
+    sorted_terms, reversed_terms, grams = _term_lookup(index)
+    postings_per_term = []
+    for pos, token in enumerate(tokens):
+        first, last = pos == 0, pos == len(tokens) - 1
+        # Interior tokens are whole words; only the query ends can be partial
+        if first and last:
+            if len(token) >= 3:
+                matched = set.intersection(*(grams.get(token[i:i + 3], set()) for i in range(len(token) - 2)))
+                matched = [t for t in matched if token in t]
+            else:
+                matched = [t for t in sorted_terms if token in t]
+        elif last:
+            matched = _prefixed(sorted_terms, token)
+        elif first:
+            matched = (t[::-1] for t in _prefixed(reversed_terms, token[::-1]))
+        else:
+            matched = (token,)
+        postings = set()
+        for term in matched:
+            postings |= terms_index.get(term, set())
+        if not postings:
+            return set()
+        postings_per_term.append(postings)
+    postings_per_term.sort(key=len)
+    return postings_per_term[0].intersection(*postings_per_term[1:])
+
+def _responses_shape():
+    """Cheap fingerprint of which question dicts are loaded; bulk loads replace or resize them"""
+    responses = st.session_state.responses
+    return id(responses), tuple((sid, id(q), len(q)) for sid, q in
+                                ((sid, sdata.get("questions", {})) for sid, sdata in responses.items()))
+
 def search_all_answers(search_query):
     if not search_query or len(search_query) < 2: 
         return []
@@ -2594,35 +3183,79 @@ def search_all_answers(search_query):
     search_query = search_query.lower()
     
     try:
-        for session in (st.session_state.current_question_bank or []):
-            session_id = session["id"]
-            session_data = st.session_state.responses.get(session_id, {})
+        # Reruns with the same query and unchanged answers reuse the last results without walking every answer;
+        # saves bump responses_version and bulk loads change the shape
+        memo = st.session_state.setdefault("_search_memo", {})
+        bank_id = st.session_state.get("current_bank_id")
+        shape = _responses_shape()
+        memo_key = (search_query, st.session_state.get("responses_version", 0), bank_id, shape)
+        if memo_key in memo:
+            return memo[memo_key]
+        
+        index = sync_search_index()
+        memo_key = (search_query, st.session_state.get("responses_version", 0), bank_id, shape)
+        get_session_index()
+        sessions_by_id = st.session_state.session_by_id
+        candidates = _search_candidates(index, search_query)
+        if candidates is None:
+            candidates = [(sid, q) for sid in sessions_by_id
+                          for q in st.session_state.responses.get(sid, {}).get("questions", {})]
+        
+        for session_id, question_text in candidates:
+            session = sessions_by_id.get(session_id)
+            if not session:
+                continue
+            answer_data = st.session_state.responses.get(session_id, {}).get("questions", {}).get(question_text)
+            if not answer_data:
+                continue
             
-            for question_text, answer_data in session_data.get("questions", {}).items():
+            # Lowercased copies are kept in the index, so matching allocates nothing per answer
+            _, _, text_lower, question_lower = index["docs"][(session_id, question_text)]
+            if search_query in text_lower or search_query in question_lower:
                 html_answer = answer_data.get("answer", "")
-                text_answer = re.sub(r'<[^>]+>', '', html_answer)
-                has_images = answer_data.get("has_images", False) or ('<img' in html_answer)
-                
-                if search_query in text_answer.lower() or search_query in question_text.lower():
-                    results.append({
-                        "session_id": session_id, 
-                        "session_title": session["title"],
-                        "question": question_text, 
-                        "answer": text_answer[:300] + "..." if len(text_answer) > 300 else text_answer,
-                        "timestamp": answer_data.get("timestamp", ""), 
-                        "word_count": len(text_answer.split()),
-                        "has_images": has_images, 
-                        "image_count": answer_data.get("image_count", 0)
-                    })
+                text_answer = answer_text(answer_data)
+                has_images = answer_data.get("has_images", False) or (_IMG_TOKEN in html_answer)
+                results.append({
+                    "session_id": session_id, 
+                    "session_title": session["title"],
+                    "question": question_text, 
+                    "answer": text_answer[:300] + "..." if len(text_answer) > 300 else text_answer,
+                    "timestamp": answer_data.get("timestamp", ""), 
+                    "word_count": len(text_answer.split()),
+                    "has_images": has_images, 
+                    "image_count": answer_data.get("image_count", 0)
+                })
+        
+        results.sort(key=lambda x: x["timestamp"], reverse=True)
+        if len(memo) >= 64:
+            memo.pop(next(iter(memo)))
+        memo[memo_key] = results
     except Exception as e:
         logger.error(f"Error searching answers: {e}")
+        results.sort(key=lambda x: x["timestamp"], reverse=True)
     
-    results.sort(key=lambda x: x["timestamp"], reverse=True)
     return results
 
 # ============================================================================
 # QUESTION BANK LOADING
 # ============================================================================
+def index_question_bank(sessions):
+    """Build the session id lookups for a newly loaded bank"""
+    st.session_state.session_index_by_id = {s["id"]: i for i, s in enumerate(sessions)}
+    st.session_state.session_by_id = {s["id"]: s for s in sessions}
+    st.session_state._indexed_bank = sessions
+
+def get_session_index():
+    """Session id -> position in the current bank, rebuilt when the bank list is replaced (e.g. by the Bank Manager)"""
+    bank = st.session_state.get("current_question_bank") or []
+    if st.session_state.get("_indexed_bank") is not bank:
+        index_question_bank(bank)
+    return st.session_state.session_index_by_id
+
+def get_session_by_id(session_id):
+    get_session_index()
+    return st.session_state.session_by_id.get(session_id)
+
 def initialize_question_bank():
     if 'current_question_bank' in st.session_state and st.session_state.current_question_bank:
         return True
@@ -2634,11 +3267,20 @@ def initialize_question_bank():
             
             sessions_csv = Path("sessions/sessions.csv")
             if sessions_csv.exists():
-                shutil.copy(str(sessions_csv), "question_banks/default/life_story_comprehensive.csv")
+                default_csv = Path("question_banks/default/life_story_comprehensive.csv")
+                src = sessions_csv.stat()
+                try:
+                    dst = default_csv.stat()
+                    stale = dst.st_size != src.st_size or dst.st_mtime_ns < src.st_mtime_ns
+                except FileNotFoundError:
+                    stale = True
+                if stale:
+                    shutil.copyfile(sessions_csv, default_csv)
             
             default = qb_manager.load_default_bank("life_story_comprehensive")
             if default:
                 st.session_state.current_question_bank = default
+                index_question_bank(default)
                 st.session_state.current_bank_name = "📖 Life Story - Comprehensive"
                 st.session_state.current_bank_type = "default"
                 st.session_state.current_bank_id = "life_story_comprehensive"
@@ -2661,6 +3303,7 @@ def initialize_question_bank():
             legacy = SessionLoader().load_sessions_from_csv()
             if legacy:
                 st.session_state.current_question_bank = legacy
+                index_question_bank(legacy)
                 st.session_state.current_bank_name = "Legacy Bank"
                 st.session_state.current_bank_type = "legacy"
                 for s in legacy:
@@ -2683,6 +3326,7 @@ def initialize_question_bank():
 def load_question_bank(sessions, bank_name, bank_type, bank_id=None):
     try:
         st.session_state.current_question_bank = sessions
+        index_question_bank(sessions)
         st.session_state.current_bank_name = bank_name
         st.session_state.current_bank_type = bank_type
         st.session_state.current_bank_id = bank_id
@@ -2709,7 +3353,7 @@ def load_question_bank(sessions, bank_name, bank_type, bank_id=None):
 # BETA READER FUNCTIONS
 # ============================================================================
 def generate_beta_reader_feedback(session_title, session_text, feedback_type="comprehensive"):
-    if not beta_reader: 
+    if not get_beta_reader(): 
         return {"error": "BetaReader not available"}
     
     try:
@@ -2809,7 +3453,7 @@ def generate_beta_reader_feedback(session_title, session_text, feedback_type="co
         
         full_context = profile_context + "\n=== SESSION CONTENT TO REVIEW ===\n\n" + session_text
         
-        return beta_reader.generate_feedback(session_title, full_context, feedback_type, accessed_profile_sections)
+        return get_beta_reader().generate_feedback(session_title, full_context, feedback_type, accessed_profile_sections)
         
     except Exception as e:
         logger.error(f"Error generating beta reader feedback: {e}")
@@ -2823,8 +3467,7 @@ def save_beta_feedback(user_id, session_id, feedback_data):
         filename = get_user_filename(user_id)
         
         if os.path.exists(filename):
-            with open(filename, 'r') as f:
-                user_data = json.load(f)
+            user_data = read_json(filename)
         else:
             user_data = {"responses": {}, "vignettes": [], "beta_feedback": {}}
         
@@ -2842,15 +3485,13 @@ def save_beta_feedback(user_id, session_id, feedback_data):
         if "feedback_type" not in feedback_copy:
             feedback_copy["feedback_type"] = "comprehensive"
         
-        for s in st.session_state.current_question_bank or []:
-            if str(s["id"]) == session_key:
-                feedback_copy["session_title"] = s["title"]
-                break
+        session = get_session_by_id(session_id)
+        if session:
+            feedback_copy["session_title"] = session["title"]
         
         user_data["beta_feedback"][session_key].append(feedback_copy)
         
-        with open(filename, 'w') as f:
-            json.dump(user_data, f, indent=2)
+        write_json_atomic(filename, user_data)
         
         logger.info(f"Beta feedback saved for user {user_id}")
         return True
@@ -2859,9 +3500,9 @@ def save_beta_feedback(user_id, session_id, feedback_data):
         return False
 
 def get_previous_beta_feedback(user_id, session_id):
-    if not beta_reader: 
+    if not get_beta_reader(): 
         return None
-    return beta_reader.get_previous_feedback(user_id, session_id, get_user_filename, load_user_data)
+    return get_beta_reader().get_previous_feedback(user_id, session_id, get_user_filename, load_user_data)
 
 def display_saved_feedback(user_id, session_id):
     user_data = load_user_data(user_id)
@@ -2877,7 +3518,7 @@ def display_saved_feedback(user_id, session_id):
     session_feedback.sort(key=lambda x: x.get('generated_at', ''), reverse=True)
     
     for i, fb in enumerate(session_feedback):
-        with st.expander(f"Feedback from {datetime.fromisoformat(fb['generated_at']).strftime('%B %d, %Y at %I:%M %p')}"):
+        with st.expander(f"Feedback from {format_feedback_date(fb['generated_at'])}"):
             col1, col2, col3 = st.columns([1, 1, 1])
             
             with col1:
@@ -2918,8 +3559,7 @@ def save_vignette_beta_feedback(user_id, vignette_id, feedback_data, vignette_ti
         filename = get_user_filename(user_id)
         
         if os.path.exists(filename):
-            with open(filename, 'r') as f:
-                user_data = json.load(f)
+            user_data = read_json(filename)
         else:
             user_data = {"responses": {}, "vignettes": [], "beta_feedback": {}, "vignette_beta_feedback": {}}
         
@@ -2941,8 +3581,7 @@ def save_vignette_beta_feedback(user_id, vignette_id, feedback_data, vignette_ti
         
         user_data["vignette_beta_feedback"][vignette_key].append(feedback_copy)
         
-        with open(filename, 'w') as f:
-            json.dump(user_data, f, indent=2)
+        write_json_atomic(filename, user_data)
         
         logger.info(f"Vignette beta feedback saved for user {user_id}")
         return True
@@ -2999,7 +3638,7 @@ def display_beta_feedback(feedback_data):
         if 'feedback' in feedback_data and feedback_data['feedback']:
             feedback_text = feedback_data['feedback']
             
-            parts = re.split(r'(\[PROFILE:.*?\])', feedback_text)
+            parts = _PROFILE_MARKER_RE.split(feedback_text)
             formatted_feedback = ""
             for i, part in enumerate(parts):
                 if part.startswith('[PROFILE:') and part.endswith(']'):
@@ -3034,6 +3673,13 @@ def display_beta_feedback(feedback_data):
 # ============================================================================
 # VIGNETTE FUNCTIONS
 # ============================================================================
+def get_vignette_manager():
+    """The logged-in user's VignetteManager, kept across reruns"""
+    mgr = st.session_state.get('vignette_manager')
+    if mgr is None or mgr.user_id != st.session_state.user_id:
+        mgr = st.session_state.vignette_manager = VignetteManager(st.session_state.user_id, client)
+    return mgr
+
 def on_vignette_select(vignette_id):
     st.session_state.selected_vignette_id = vignette_id
     st.session_state.show_vignette_detail = True
@@ -3048,7 +3694,7 @@ def on_vignette_edit(vignette_id):
     st.rerun()
 
 def on_vignette_delete(vignette_id):
-    if VignetteManager and st.session_state.get('vignette_manager', VignetteManager(st.session_state.user_id)).delete_vignette(vignette_id):
+    if VignetteManager and get_vignette_manager().delete_vignette(vignette_id):
         st.success("Deleted!"); 
         st.rerun()
     else: 
@@ -3074,11 +3720,9 @@ def show_vignette_modal():
     
     st.title("✏️ Edit Vignette" if st.session_state.get('editing_vignette_id') else "✍️ Create Vignette")
     
-    if 'vignette_manager' not in st.session_state: 
-        st.session_state.vignette_manager = VignetteManager(st.session_state.user_id)
-    
-    edit = st.session_state.vignette_manager.get_vignette_by_id(st.session_state.editing_vignette_id) if st.session_state.get('editing_vignette_id') else None
-    st.session_state.vignette_manager.display_vignette_creator(on_publish=on_vignette_publish, edit_vignette=edit)
+    vignette_manager = get_vignette_manager()
+    edit = vignette_manager.get_vignette_by_id(st.session_state.editing_vignette_id) if st.session_state.get('editing_vignette_id') else None
+    vignette_manager.display_vignette_creator(on_publish=on_vignette_publish, edit_vignette=edit)
     
     if st.session_state.get('editing_vignette_id') and edit:
         st.divider()
@@ -3097,7 +3741,7 @@ def show_vignette_modal():
             with col2:
                 if st.button("🦋 Get Beta Read", key=f"beta_vignette_edit_btn_{edit['id']}", type="primary", use_container_width=True):
                     with st.spinner("Beta Reader is analyzing your vignette with profile context..."):
-                        if beta_reader:
+                        if get_beta_reader():
                             vignette_text = edit.get('content', '')
                             if vignette_text and len(vignette_text.strip()) > 50:
                                 fb = generate_beta_reader_feedback(
@@ -3136,7 +3780,7 @@ def show_vignette_modal():
                 
                 if 'feedback' in fb and fb['feedback']:
                     feedback_text = fb['feedback']
-                    parts = re.split(r'(\[PROFILE:.*?\])', feedback_text)
+                    parts = _PROFILE_MARKER_RE.split(feedback_text)
                     formatted_feedback = ""
                     for part in parts:
                         if part.startswith('[PROFILE:') and part.endswith(']'):
@@ -3189,13 +3833,12 @@ def show_vignette_manager():
     
     st.title("📚 Your Vignettes")
     
-    if 'vignette_manager' not in st.session_state: 
-        st.session_state.vignette_manager = VignetteManager(st.session_state.user_id)
+    vignette_manager = get_vignette_manager()
     
     filter_map = {"All Stories": "all", "Published": "published", "Drafts": "drafts"}
     filter_option = st.radio("Show:", ["All Stories", "Published", "Drafts"], horizontal=True, key="vign_filter_radio")
     
-    st.session_state.vignette_manager.display_vignette_gallery(
+    vignette_manager.display_vignette_gallery(
         filter_by=filter_map.get(filter_option, "all"),
         on_select=on_vignette_select, 
         on_edit=on_vignette_edit, 
@@ -3228,16 +3871,14 @@ def show_vignette_detail():
             st.session_state.selected_vignette_id = None
             st.rerun()
     
-    if 'vignette_manager' not in st.session_state: 
-        st.session_state.vignette_manager = VignetteManager(st.session_state.user_id)
-    
-    vignette = st.session_state.vignette_manager.get_vignette_by_id(st.session_state.selected_vignette_id)
+    vignette_manager = get_vignette_manager()
+    vignette = vignette_manager.get_vignette_by_id(st.session_state.selected_vignette_id)
     if not vignette: 
         st.error("Vignette not found")
         st.session_state.show_vignette_detail = False
         return
     
-    st.session_state.vignette_manager.display_full_vignette(
+    vignette_manager.display_full_vignette(
         st.session_state.selected_vignette_id,
         on_back=lambda: st.session_state.update(show_vignette_detail=False, selected_vignette_id=None),
         on_edit=on_vignette_edit
@@ -3260,7 +3901,7 @@ def show_vignette_detail():
         with col2:
             if st.button("🦋 Get Beta Read", key=f"beta_vignette_btn_{vignette['id']}", type="primary", use_container_width=True):
                 with st.spinner("Beta Reader is analyzing your vignette with profile context..."):
-                    if beta_reader:
+                    if get_beta_reader():
                         vignette_text = vignette.get('content', '')
                         if vignette_text and len(vignette_text.strip()) > 50:
                             fb = generate_beta_reader_feedback(
@@ -3299,7 +3940,7 @@ def show_vignette_detail():
             
             if 'feedback' in fb and fb['feedback']:
                 feedback_text = fb['feedback']
-                parts = re.split(r'(\[PROFILE:.*?\])', feedback_text)
+                parts = _PROFILE_MARKER_RE.split(feedback_text)
                 formatted_feedback = ""
                 for part in parts:
                     if part.startswith('[PROFILE:') and part.endswith(']'):
@@ -3400,8 +4041,14 @@ def show_session_creator():
         st.rerun()
     
     st.title("📋 Create Custom Session")
-    SessionManager(st.session_state.user_id, "sessions/sessions.csv").display_session_creator()
-    st.markdown('</div>', unsafe_allow_html=True)
+    get_session_manager().display_session_creator()
+
+def get_session_manager():
+    """The logged-in user's SessionManager, kept across reruns so sessions.csv is parsed once"""
+    mgr = st.session_state.get('session_manager')
+    if mgr is None or mgr.user_id != st.session_state.user_id:
+        mgr = st.session_state.session_manager = SessionManager(st.session_state.user_id, "sessions/sessions.csv")
+    return mgr
 
 def show_session_manager():
     if not SessionManager: 
@@ -3416,7 +4063,7 @@ def show_session_manager():
         st.rerun()
     
     st.title("📖 Session Manager")
-    mgr = SessionManager(st.session_state.user_id, "sessions/sessions.csv")
+    mgr = get_session_manager()
     
     if st.button("➕ Create New Session", key="create_new_session_btn", type="primary", use_container_width=True):
         st.session_state.show_session_manager = False; 
@@ -3424,8 +4071,8 @@ def show_session_manager():
         st.rerun()
     
     st.divider()
-    mgr.display_session_grid(cols=2, on_session_select=lambda sid: [st.session_state.update(
-        current_session=i, current_question=0, current_question_override=None) for i, s in enumerate(st.session_state.current_question_bank) if s["id"] == sid][0])
+    mgr.display_session_grid(cols=2, on_session_select=lambda sid: st.session_state.update(
+        current_session=get_session_index()[sid], current_question=0, current_question_override=None))
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -3524,8 +4171,8 @@ def import_text_file_main(uploaded_file):
         
         elif file_extension == 'md':
             file_content = uploaded_file.read().decode('utf-8', errors='ignore')
-            file_content = re.sub(r'#{1,6}\s*', '', file_content)
-            file_content = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', file_content)
+            file_content = _MD_HEADING_RE.sub('', file_content)
+            file_content = _MD_LINK_RE.sub(r'\1', file_content)
         
         else:
             st.error(f"Unsupported format: .{file_extension}")
@@ -3539,8 +4186,8 @@ def import_text_file_main(uploaded_file):
         if file_size_mb > 10:
             st.warning(f"⚠️ Large file ({file_size_mb:.1f}MB) - processing may be slow")
         
-        file_content = re.sub(r'\s+', ' ', file_content)
-        sentences = re.split(r'[.!?]+', file_content)
+        file_content = _WHITESPACE_RE.sub(' ', file_content)
+        sentences = _SENTENCE_END_RE.split(file_content)
         paragraphs = []
         current_para = []
         
@@ -3579,16 +4226,23 @@ if not st.session_state.qb_manager_initialized:
 
 SESSIONS = st.session_state.get('current_question_bank', [])
 
+if st.session_state.logged_in:
+    flush_user_data()
+    check_account_save()
+
 if st.session_state.logged_in and st.session_state.user_id and not st.session_state.data_loaded:
-    user_data = load_user_data(st.session_state.user_id)
-    if "responses" in user_data:
-        for sid_str, sdata in user_data["responses"].items():
-            try: 
-                sid = int(sid_str)
-            except: 
-                continue
-            if sid in st.session_state.responses and "questions" in sdata and sdata["questions"]:
-                st.session_state.responses[sid]["questions"] = sdata["questions"]
+    wanted = {str(sid) for sid in st.session_state.responses}
+    for sid_str, sdata in changed_response_sessions(st.session_state.user_id, wanted).items():
+        try: 
+            sid = int(sid_str)
+        except: 
+            continue
+        if sid in st.session_state.responses and "questions" in sdata and sdata["questions"]:
+            st.session_state.responses[sid]["questions"] = sdata["questions"]
+            # Backfill cached text/word counts for answers saved before they were stored
+            for q_data in sdata["questions"].values():
+                answer_text(q_data)
+                answer_word_count(q_data)
     st.session_state.data_loaded = True
     init_image_handler()
     logger.info(f"User data loaded for {st.session_state.user_id}")
@@ -3652,16 +4306,18 @@ def show_admin_panel():
                         if acc_file.exists():
                             acc_file.unlink()
                         
-                        # Remove from index
-                        if user['id'] in index_data:
-                            del index_data[user['id']]
-                            with open(index_file, 'w') as f:
-                                json.dump(index_data, f, indent=2)
+                        # Remove from index; re-read after any background account save so its entry isn't lost
+                        wait_for_account_save()
+                        index_data = read_json(index_file)
+                        if index_data.pop(user['id'], None) is not None:
+                            write_json_atomic(index_file, index_data)
+                            load_email_index.clear()
                         
                         # Delete user data file
                         data_file = Path(get_user_filename(user['id']))
                         if data_file.exists():
                             data_file.unlink()
+                        shutil.rmtree(get_responses_dir(user['id']), ignore_errors=True)
                         
                         # Delete session file
                         session_file = Path(SESSION_DIR) / f"{user['id']}.session"
@@ -3772,6 +4428,12 @@ if not st.session_state.logged_in:
                         st.error(f"Error: {result.get('error', 'Unknown error')}")
     st.stop()
 
+# Writes queued by button handlers on the previous run (e.g. Apply Corrections)
+pending_save = st.session_state.pop("_pending_save", None)
+if pending_save:
+    if not save_response(*pending_save):
+        st.error("Failed to save")
+
 # ============================================================================
 # PROFILE SETUP MODAL
 # ============================================================================
@@ -3844,7 +4506,7 @@ if st.session_state.get('show_profile_setup', False):
         st.markdown("**🔐 Security Status:** Your data is encrypted at rest and never shared with third parties.")
         
         if st.button("💾 Save Privacy Settings", key="save_privacy_settings_btn", type="primary", use_container_width=True):
-            save_account_data(st.session_state.user_account)
+            save_account_data_async(st.session_state.user_account)
             st.success("Privacy settings saved!")
             st.rerun()
     
@@ -4022,6 +4684,76 @@ if st.session_state.get('show_support', False):
 # ============================================================================
 # SIDEBAR
 # ============================================================================
+# Sidebar panels whose own widgets only need to rerun themselves
+@st.fragment
+def _render_export_panel():
+    st.subheader("📤 Publish Your Book")
+
+    if st.session_state.logged_in and st.session_state.user_id:
+        if sum(get_answer_counts().values()):
+            if st.button("📚 Open Book Publisher", key="open_publisher_btn", type="primary", use_container_width=True):
+                st.session_state.show_publisher = True
+                st.rerun()
+            
+            with st.expander("📦 JSON Backup", expanded=False):
+                # Images are read and encoded only when a backup is asked for, not on every rerun
+                if st.button("📦 Prepare JSON Backup", key="prepare_json_backup_btn", use_container_width=True):
+                    with st.spinner("Preparing backup..."):
+                        export_sessions = [(s["id"], s["title"], st.session_state.responses.get(s["id"], {}).get("questions", {})) for s in SESSIONS]
+                        export_sig = _blake2b(json_dumps_bytes(export_sessions), digest_size=16).hexdigest()
+                        export_data = build_export_data(st.session_state.user_id, export_sig, export_sessions, st.session_state.image_handler)
+                        complete_data = {
+                            "user": st.session_state.user_id, 
+                            "user_profile": st.session_state.user_account.get('profile', {}),
+                            "narrative_gps": st.session_state.user_account.get('narrative_gps', {}),
+                            "enhanced_profile": st.session_state.user_account.get('enhanced_profile', {}),
+                            "cover_design": st.session_state.user_account.get('cover_design', {}),
+                            "stories": export_data, 
+                            "export_date": datetime.now().isoformat(),
+                            "summary": {
+                                "total_stories": len(export_data), 
+                                "total_sessions": len(set(s['session_id'] for s in export_data))
+                            }
+                        }
+                        json_data = json.dumps(complete_data, indent=2)
+                    st.download_button(
+                        label="📥 Download JSON Backup", 
+                        data=json_data,
+                        file_name=f"Tell_My_Story_Backup_{st.session_state.user_id}.json",
+                        mime="application/json", 
+                        use_container_width=True,
+                        key="json_backup_btn"
+                    )
+        else: 
+            st.warning("No stories yet! Start writing to publish.")
+    else: 
+        st.warning("Please log in to export your data.")
+    
+
+@st.fragment
+def _render_search_panel():
+    st.subheader("🔍 Search Your Stories")
+    search_query = st.text_input("Search answers & captions...", placeholder="e.g., childhood, wedding, photo", key="global_search_input")
+    if search_query and len(search_query) >= 2:
+        results = search_all_answers(search_query)
+        if results:
+            st.success(f"Found {len(results)} matches")
+            with st.expander(f"📖 {len(results)} Results", expanded=True):
+                for i, r in enumerate(results[:10]):
+                    st.markdown(f"**Session {r['session_id']}: {r['session_title']}**  \n*{r['question']}*")
+                    if r.get('has_images'):
+                        st.caption(f"📸 Contains {r.get('image_count', 1)} photo(s)")
+                    st.markdown(f"{r['answer'][:150]}...")
+                    if st.button(f"Go to Session", key=f"srch_go_{i}_{r['session_id']}", use_container_width=True):
+                        if r['session_id'] in get_session_index():
+                            st.session_state.update(current_session=get_session_index()[r['session_id']], current_question_override=r['question'], show_ai_rewrite_menu=False)
+                            st.rerun()
+                    st.divider()
+                if len(results) > 10: 
+                    st.info(f"... and {len(results)-10} more matches")
+        else: 
+            st.info("No matches found")
+
 with st.sidebar:
     st.markdown('<div class="sidebar-header"><h2>Tell My Story</h2><p>Your Life Timeline</p></div>', unsafe_allow_html=True)
     
@@ -4070,17 +4802,26 @@ with st.sidebar:
     st.divider()
     st.header("📖 Sessions")
     if st.session_state.current_question_bank:
+        # One selectbox instead of a button per session keeps the sidebar to a single widget
+        session_labels = []
+        answer_counts = get_answer_counts()
+        current = min(st.session_state.current_session, len(st.session_state.current_question_bank) - 1)
         for i, s in enumerate(st.session_state.current_question_bank):
             sid = s["id"]
-            sdata = st.session_state.responses.get(sid, {})
-            resp_cnt = len(sdata.get("questions", {}))
+            resp_cnt = answer_counts[sid]
             total_q = len(s["questions"])
             status = "🟢" if resp_cnt == total_q and total_q > 0 else "🟡" if resp_cnt > 0 else "🔴"
-            if i == st.session_state.current_session: 
+            if i == current:
                 status = "▶️"
-            if st.button(f"{status} Session {sid}: {s['title']}", key=f"sel_sesh_{i}", use_container_width=True):
-                st.session_state.update(current_session=i, current_question=0, editing=False, current_question_override=None, show_ai_rewrite_menu=False)
-                st.rerun()
+            session_labels.append(f"{status} Session {sid}: {s['title']}")
+        
+        def _select_session():
+            st.session_state.update(current_session=st.session_state.sidebar_session_select, current_question=0, editing=False, current_question_override=None, show_ai_rewrite_menu=False)
+        
+        # Stable key so relabelled options keep the widget; set each run so navigation elsewhere shows up here
+        st.session_state.sidebar_session_select = current
+        st.selectbox("Session", range(len(session_labels)), format_func=session_labels.__getitem__,
+                     key="sidebar_session_select", on_change=_select_session, label_visibility="collapsed")
     
     st.divider()
     st.header("✨ Vignettes")
@@ -4088,11 +4829,7 @@ with st.sidebar:
         import uuid
         new_id = str(uuid.uuid4())[:8]
         
-        if 'vignette_manager' not in st.session_state:
-            from vignettes import VignetteManager
-            st.session_state.vignette_manager = VignetteManager(st.session_state.user_id)
-        
-        st.session_state.vignette_manager.create_vignette_with_id(
+        get_vignette_manager().create_vignette_with_id(
             id=new_id,
             title="Untitled Vignette",
             content="<p>Write your story here...</p>",
@@ -4119,77 +4856,7 @@ with st.sidebar:
         st.rerun()
     
     st.divider()
-    st.subheader("📤 Publish Your Book")
-
-    if st.session_state.logged_in and st.session_state.user_id:
-        export_data = []
-        for session in SESSIONS:
-            sid = session["id"]
-            sdata = st.session_state.responses.get(sid, {})
-            for q, a in sdata.get("questions", {}).items():
-                images_with_data = []
-                if a.get("images"):
-                    for img_ref in a.get("images", []):
-                        img_id = img_ref.get("id")
-                        b64 = st.session_state.image_handler.get_image_base64(img_id) if st.session_state.image_handler else None
-                        caption = img_ref.get("caption", "")
-                        if b64:
-                            images_with_data.append({
-                                "id": img_id, "base64": b64, "caption": caption
-                            })
-                
-                export_item = {
-                    "question": q, 
-                    "answer_text": re.sub(r'<[^>]+>', '', a.get("answer", "")),
-                    "timestamp": a.get("timestamp", ""), 
-                    "session_id": sid, 
-                    "session_title": session["title"],
-                    "has_images": a.get("has_images", False), 
-                    "image_count": a.get("image_count", 0),
-                    "images": images_with_data
-                }
-                export_data.append(export_item)
-        
-        if export_data:
-            complete_data = {
-                "user": st.session_state.user_id, 
-                "user_profile": st.session_state.user_account.get('profile', {}),
-                "narrative_gps": st.session_state.user_account.get('narrative_gps', {}),
-                "enhanced_profile": st.session_state.user_account.get('enhanced_profile', {}),
-                "cover_design": st.session_state.user_account.get('cover_design', {}),
-                "stories": export_data, 
-                "export_date": datetime.now().isoformat(),
-                "summary": {
-                    "total_stories": len(export_data), 
-                    "total_sessions": len(set(s['session_id'] for s in export_data))
-                }
-            }
-            
-            temp_file = f"temp_export_{st.session_state.user_id}.json"
-            with open(temp_file, 'w') as f:
-                json.dump(complete_data, f)
-            
-            st.session_state.publisher_data = complete_data
-            st.session_state.publisher_data_path = temp_file
-            
-            if st.button("📚 Open Book Publisher", key="open_publisher_btn", type="primary", use_container_width=True):
-                st.session_state.show_publisher = True
-                st.rerun()
-            
-            with st.expander("📦 JSON Backup", expanded=False):
-                json_data = json.dumps(complete_data, indent=2)
-                st.download_button(
-                    label="📥 Download JSON Backup", 
-                    data=json_data,
-                    file_name=f"Tell_My_Story_Backup_{st.session_state.user_id}.json",
-                    mime="application/json", 
-                    use_container_width=True,
-                    key="json_backup_btn"
-                )
-        else: 
-            st.warning("No stories yet! Start writing to publish.")
-    else: 
-        st.warning("Please log in to export your data.")
+    _render_export_panel()
     
     st.divider()
     st.subheader("⚠️ Clear Data")
@@ -4224,28 +4891,7 @@ with st.sidebar:
             st.rerun()
     
     st.divider()
-    st.subheader("🔍 Search Your Stories")
-    search_query = st.text_input("Search answers & captions...", placeholder="e.g., childhood, wedding, photo", key="global_search_input")
-    if search_query and len(search_query) >= 2:
-        results = search_all_answers(search_query)
-        if results:
-            st.success(f"Found {len(results)} matches")
-            with st.expander(f"📖 {len(results)} Results", expanded=True):
-                for i, r in enumerate(results[:10]):
-                    st.markdown(f"**Session {r['session_id']}: {r['session_title']}**  \n*{r['question']}*")
-                    if r.get('has_images'):
-                        st.caption(f"📸 Contains {r.get('image_count', 1)} photo(s)")
-                    st.markdown(f"{r['answer'][:150]}...")
-                    if st.button(f"Go to Session", key=f"srch_go_{i}_{r['session_id']}", use_container_width=True):
-                        for idx, s in enumerate(SESSIONS):
-                            if s["id"] == r['session_id']:
-                                st.session_state.update(current_session=idx, current_question_override=r['question'], show_ai_rewrite_menu=False)
-                                st.rerun()
-                    st.divider()
-                if len(results) > 10: 
-                    st.info(f"... and {len(results)-10} more matches")
-        else: 
-            st.info("No matches found")
+    _render_search_panel()
 
 # ============================================================================
 # PUBLISHER FUNCTIONS - COMPLETE
@@ -4263,13 +4909,32 @@ def clean_text_for_export(text):
         text = text.replace('&quot;', '"')
         text = text.replace('&#39;', "'")
         
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _TAG_RE.sub('', text)
         
         return text.strip()
     except Exception as e:
         logger.error(f"Error cleaning text for export: {e}")
         return ""
 
+_decoded_export_images = {}
+
+def export_image_bytes(img):
+    """Raw bytes for an export story image (read from its path, or decoded), at most once per run by image id"""
+    key = img.get('id') or img.get('path') or img['base64']
+    data = _decoded_export_images.get(key)
+    if data is None:
+        if img.get('path'):
+            with open(img['path'], 'rb') as f:
+                data = f.read()
+        else:
+            data = binascii.a2b_base64(img['base64'])
+        _decoded_export_images[key] = data
+    return data
+
+def export_image_b64(img):
+    """Base64 text for an export story image, for sinks that embed it (HTML, JSON)"""
+    return img.get('base64') or b64encode_str(export_image_bytes(img))
+
 def generate_docx_book(title, author, stories, format_style="interview", include_toc=True, include_images=True, cover_image=None, cover_choice="simple"):
     """Generate a Word document"""
     try:
@@ -4381,10 +5046,9 @@ def generate_docx_book(title, author, stories, format_style="interview", include
             
             if include_images and story.get('images'):
                 for img in story.get('images', []):
-                    if img.get('base64'):
+                    if img.get('path') or img.get('base64'):
                         try:
-                            img_data = base64.b64decode(img['base64'])
-                            img_stream = io.BytesIO(img_data)
+                            img_stream = io.BytesIO(export_image_bytes(img))
                             
                             p = doc.add_paragraph()
                             p.alignment = WD_ALIGN_PARAGRAPH.CENTER
@@ -4594,7 +5258,7 @@ def generate_html_book(title, author, stories, format_style="interview", include
         
         if cover_choice == "uploaded" and cover_image:
             try:
-                img_base64 = base64.b64encode(cover_image).decode()
+                img_base64 = b64encode_str(cover_image)
                 html_parts.append(f'''
                 <div>
                     <img src="data:image/jpeg;base64,{img_base64}" class="cover-image" alt="Book Cover">
@@ -4668,8 +5332,8 @@ def generate_html_book(title, author, stories, format_style="interview", include
             
             if include_images and story.get('images'):
                 for img in story.get('images', []):
-                    if img.get('base64'):
-                        img_data = img['base64']
+                    if img.get('path') or img.get('base64'):
+                        img_data = export_image_b64(img)
                         if not img_data.startswith('data:image'):
                             html_parts.append(f'<img src="data:image/jpeg;base64,{img_data}" class="story-image" alt="Story image">')
                         else:
@@ -4770,8 +5434,8 @@ def generate_epub_book(title, author, stories, format_style="interview", include
                     
                     if include_images and s.get('images'):
                         for img in s.get('images', []):
-                            if img.get('base64'):
-                                img_data = base64.b64decode(img['base64'])
+                            if img.get('path') or img.get('base64'):
+                                img_data = export_image_bytes(img)
                                 img_file = f"img_{chapter_index}_{img.get('id', 'unknown')}.jpg"
                                 img_item = epub.EpubImage()
                                 img_item.file_name = f"images/{img_file}"
@@ -4896,11 +5560,12 @@ if st.session_state.get('show_publisher', False):
                 if answer_data.get("images") and st.session_state.image_handler:
                     for img_ref in answer_data.get("images", []):
                         img_id = img_ref.get("id")
-                        b64 = st.session_state.image_handler.get_image_base64(img_id) if st.session_state.image_handler else None
-                        if b64:
+                        # Exporters read the file themselves; only HTML and JSON need base64
+                        img_path = st.session_state.image_handler.get_image_path(img_id)
+                        if img_path:
                             images_with_data.append({
                                 "id": img_id,
-                                "base64": b64,
+                                "path": str(img_path),
                                 "caption": img_ref.get("caption", "")
                             })
                 
@@ -5126,7 +5791,9 @@ if st.session_state.get('show_publisher', False):
                     "user_profile": st.session_state.user_account.get('profile', {}),
                     "book_title": book_title,
                     "book_author": book_author,
-                    "stories": stories_for_export,
+                    "stories": [{**story, "images": [{"id": img["id"], "base64": export_image_b64(img), "caption": img["caption"]}
+                                                     for img in story["images"]]}
+                                for story in stories_for_export],
                     "export_date": datetime.now().isoformat(),
                     "summary": {
                         "total_stories": len(stories_for_export),
@@ -5210,7 +5877,7 @@ with col1:
     st.subheader(f"Session {current_session_id}: {current_session['title']}")
     if len(current_session.get("questions", [])) > 0:
         sdata = st.session_state.responses.get(current_session_id, {})
-        answered = len(sdata.get("questions", {}))
+        answered = get_answer_counts()[current_session_id]
         total = len(current_session["questions"])
         if total > 0: 
             st.progress(answered/total)
@@ -5220,8 +5887,7 @@ with col1:
         total_words = 0
         for q_data in sdata.get("questions", {}).values():
             if q_data.get("answer"):
-                text_only = re.sub(r'<[^>]+>', '', q_data["answer"])
-                total_words += len(re.findall(r'\w+', text_only))
+                total_words += answer_word_count(q_data)
         st.caption(f"📝 Total words written in this chapter: {total_words}")
         
 with col2:
@@ -5286,7 +5952,7 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-question_text_safe = "".join(c for c in current_question_text if c.isalnum() or c.isspace()).replace(" ", "_")[:30]
+question_text_safe = _KEY_UNSAFE_RE.sub('', current_question_text).replace(" ", "_")[:30]
 editor_component_key = f"quill_editor_{current_session_id}_{question_text_safe}_v{st.session_state[version_key]}"
 
 logger.info(f"Creating Quill editor with key: {editor_component_key}")
@@ -5306,7 +5972,7 @@ try:
         st.error("Quill editor not available")
         content = st.text_area(
             "Your story (fallback editor):",
-            value=re.sub(r'<[^>]+>', '', st.session_state[content_key]),
+            value=strip_html(st.session_state[content_key]),
             height=300,
             key=f"fallback_{editor_base_key}"
         )
@@ -5318,7 +5984,7 @@ except Exception as e:
     st.error(f"Error loading editor: {str(e)}")
     content = st.text_area(
         "Your story (fallback editor):",
-        value=re.sub(r'<[^>]+>', '', st.session_state[content_key]),
+        value=strip_html(st.session_state[content_key]),
         height=300,
         key=f"fallback_{editor_base_key}"
     )
@@ -5335,7 +6001,7 @@ col1, col2, col3, col4, col5, col6, col7, col8 = st.columns([1, 1, 1, 1, 1, 1, 1
 spellcheck_base = f"spell_{editor_base_key}"
 spell_result_key = f"{spellcheck_base}_result"
 current_content = st.session_state.get(content_key, "")
-has_content = current_content and current_content != "<p><br></p>" and current_content != "<p>Start writing your story here...</p>"
+has_content = _has_content(current_content)
 showing_results = spell_result_key in st.session_state and st.session_state[spell_result_key].get("show", False)
 
 import_key = f"import_{editor_base_key}"
@@ -5346,11 +6012,10 @@ show_import = st.session_state[import_key]
 with col1:
     if st.button("💾 Save", key=f"save_btn_{editor_base_key}", type="primary", use_container_width=True):
         current_content = st.session_state[content_key]
-        if current_content and current_content.strip() and current_content != "<p><br></p>" and current_content != "<p>Start writing your story here...</p>":
+        if _has_content(current_content):
             with st.spinner("Saving your story..."):
                 if save_response(current_session_id, current_question_text, current_content):
-                    st.success("✅ Saved!")
-                    time.sleep(0.5)
+                    st.toast("✅ Saved!", icon="💾")
                     st.rerun()
                 else: 
                     st.error("Failed to save")
@@ -5371,13 +6036,13 @@ with col3:
     if has_content and not showing_results:
         if st.button("🔍 Spell Check", key=f"spell_{editor_base_key}", use_container_width=True):
             with st.spinner("Checking spelling and grammar..."):
-                text_only = re.sub(r'<[^>]+>', '', current_content)
-                if len(text_only.split()) >= 3:
-                    corrected = auto_correct_text(text_only)
-                    if corrected and corrected != text_only:
+                text_only = strip_html(current_content)
+                if _has_min_words(text_only, 3):
+                    originals, corrected = spell_check_paragraphs(current_content)
+                    if corrected != originals:
                         st.session_state[spell_result_key] = {
                             "original": text_only,
-                            "corrected": corrected,
+                            "corrected": "".join(f"<p>{html.escape(c)}</p>" for c in corrected),
                             "show": True
                         }
                     else:
@@ -5400,45 +6065,7 @@ with col4:
         st.button("✨ AI Rewrite", key=f"rewrite_disabled_{editor_base_key}", disabled=True, use_container_width=True)
 
 with col5:
-    if st.button("💭 Prompt Me", key=f"prompt_btn_{editor_base_key}", use_container_width=True):
-        with st.spinner("Generating personalized writing prompts..."):
-            profile_context = get_narrative_gps_for_ai()
-            
-            birth_year = None
-            if st.session_state.user_account and 'profile' in st.session_state.user_account:
-                birthdate = st.session_state.user_account['profile'].get('birthdate', '')
-                if birthdate:
-                    year_match = re.search(r'\d{4}', birthdate)
-                    if year_match:
-                        birth_year = int(year_match.group())
-            
-            if st.session_state.user_account and 'enhanced_profile' in st.session_state.user_account:
-                ep = st.session_state.user_account['enhanced_profile']
-                if ep:
-                    profile_context += "\n\nPersonal background:\n"
-                    if ep.get('first_name'): 
-                        profile_context += f"- Name: {ep.get('first_name')}\n"
-                    if ep.get('birth_place'): 
-                        profile_context += f"- Birth place: {ep['birth_place']}\n"
-                    if ep.get('childhood_home'): 
-                        profile_context += f"- Childhood home: {ep['childhood_home'][:150]}\n"
-                    if ep.get('parents'):
-                        profile_context += f"- Parents: {ep['parents'][:150]}\n"
-            
-            result = generate_writing_prompts(
-                current_session['title'],
-                current_question_text,
-                current_content,
-                profile_context,
-                birth_year
-            )
-            
-            if result.get('success'):
-                st.session_state.current_prompt_data = result
-                st.session_state.show_prompt_modal = True
-                st.rerun()
-            else:
-                st.error(result.get('error', 'Could not generate prompts'))
+    prompt_clicked = st.button("💭 Prompt Me", key=f"prompt_btn_{editor_base_key}", use_container_width=True)
 
 with col6:
     button_label = "📂 Close Import" if show_import else "📂 Import File"
@@ -5495,6 +6122,50 @@ with col8:
                 st.session_state.show_ai_rewrite_menu = False
                 st.rerun()
 
+if prompt_clicked:
+    # Full-width slot below the toolbar so the prompts stream readably before the modal opens
+    prompt_slot = st.empty()
+    with st.spinner("Generating personalized writing prompts..."):
+        profile_context = get_narrative_gps_for_ai()
+        
+        birth_year = None
+        if st.session_state.user_account and 'profile' in st.session_state.user_account:
+            birthdate = st.session_state.user_account['profile'].get('birthdate', '')
+            if birthdate:
+                year_match = _YEAR_RE.search(birthdate)
+                if year_match:
+                    birth_year = int(year_match.group())
+        
+        if st.session_state.user_account and 'enhanced_profile' in st.session_state.user_account:
+            ep = st.session_state.user_account['enhanced_profile']
+            if ep:
+                profile_context += "\n\nPersonal background:\n"
+                if ep.get('first_name'): 
+                    profile_context += f"- Name: {ep.get('first_name')}\n"
+                if ep.get('birth_place'): 
+                    profile_context += f"- Birth place: {ep['birth_place']}\n"
+                if ep.get('childhood_home'): 
+                    profile_context += f"- Childhood home: {ep['childhood_home'][:150]}\n"
+                if ep.get('parents'):
+                    profile_context += f"- Parents: {ep['parents'][:150]}\n"
+        
+        result = generate_writing_prompts(
+            current_session['title'],
+            current_question_text,
+            current_content,
+            profile_context,
+            birth_year,
+            placeholder=prompt_slot
+        )
+        
+        if result.get('success'):
+            # The modal needs a rerun to open; it re-renders the same, now persisted, prompts
+            st.session_state.current_prompt_data = result
+            st.session_state.show_prompt_modal = True
+            st.rerun()
+        else:
+            st.error(result.get('error', 'Could not generate prompts'))
+
 if showing_results:
     result = st.session_state[spell_result_key]
     if "corrected" in result:
@@ -5510,10 +6181,10 @@ if showing_results:
                     corrected = f'<p>{corrected}</p>'
                 
                 st.session_state[content_key] = corrected
-                save_response(current_session_id, current_question_text, corrected)
+                st.session_state._pending_save = (current_session_id, current_question_text, corrected)
                 st.session_state[version_key] += 1
                 st.session_state[spell_result_key] = {"show": False}
-                st.success("✅ Corrections applied!")
+                st.toast("✅ Corrections applied!")
                 st.rerun()
             
             if st.button("❌ Dismiss", key=f"{spellcheck_base}_dismiss", use_container_width=True):
@@ -5559,7 +6230,7 @@ if show_import:
                     imported_html = import_text_file_main(uploaded_file)
                     if imported_html:
                         current = st.session_state.get(content_key, "")
-                        if current and current != "<p>Start writing your story here...</p>" and current != "<p><br></p>":
+                        if _has_content(current):
                             st.session_state[f"{import_key}_pending"] = imported_html
                             st.session_state[f"{import_key}_show_options"] = True
                             st.rerun()
@@ -5624,7 +6295,7 @@ if st.session_state.logged_in and st.session_state.image_handler:
             col1, col2, col3 = st.columns([2, 3, 1])
             
             with col1:
-                st.markdown(img.get("thumb_html", ""), unsafe_allow_html=True)
+                st.image(img["thumb_path"], width=200)
             
             with col2:
                 caption_text = img.get("caption", "")
@@ -5643,14 +6314,15 @@ if st.session_state.logged_in and st.session_state.image_handler:
     with st.expander("📤 Upload New Photos", expanded=len(existing_images) == 0):
         st.markdown("**Add new photos to your story:**")
         
-        uploaded_file = st.file_uploader(
-            "Choose an image...", 
-            type=['jpg', 'jpeg', 'png'], 
-            key=f"up_{current_session_id}_{hash(current_question_text)}",
-            label_visibility="collapsed"
-        )
-        
-        if uploaded_file:
+        # One form so picking a file or typing a caption doesn't rerun the page until Upload is pressed
+        with st.form(f"upload_form_{current_session_id}_{hash(current_question_text)}", clear_on_submit=True, border=False):
+            uploaded_file = st.file_uploader(
+                "Choose an image...", 
+                type=['jpg', 'jpeg', 'png'], 
+                key=f"up_{current_session_id}_{hash(current_question_text)}",
+                label_visibility="collapsed"
+            )
+            
             col1, col2 = st.columns([3, 1])
             with col1:
                 caption = st.text_input(
@@ -5666,18 +6338,23 @@ if st.session_state.logged_in and st.session_state.image_handler:
                     help="Full Page: 1600px wide, Inline: 800px wide"
                 )
             with col2:
-                if st.button("📤 Upload", key=f"btn_{current_session_id}_{hash(current_question_text)}", type="primary", use_container_width=True):
-                    with st.spinner("Uploading and optimizing..."):
-                        usage_type = "full_page" if usage == "Full Page" else "inline"
-                        result = st.session_state.image_handler.save_image(
-                            uploaded_file, current_session_id, current_question_text, caption, usage_type
-                        )
-                        if result:
-                            st.success("✅ Photo uploaded and optimized!")
-                            time.sleep(1.5)
-                            st.rerun()
-                        else:
-                            st.error("Upload failed")
+                submitted = st.form_submit_button("📤 Upload", type="primary", use_container_width=True)
+        
+        if submitted:
+            if not uploaded_file:
+                st.warning("Choose a photo to upload first")
+            else:
+                with st.spinner("Uploading and optimizing..."):
+                    usage_type = "full_page" if usage == "Full Page" else "inline"
+                    result = st.session_state.image_handler.save_image(
+                        uploaded_file, current_session_id, current_question_text, caption, usage_type
+                    )
+                    if result:
+                        st.success("✅ Photo uploaded and optimized!")
+                        time.sleep(1.5)
+                        st.rerun()
+                    else:
+                        st.error("Upload failed")
     
     st.markdown("---")
 
@@ -5685,7 +6362,7 @@ if st.session_state.logged_in and st.session_state.image_handler:
 # PREVIEW SECTION
 # ============================================================================
 current_content = st.session_state.get(content_key, "")
-if current_content and current_content != "<p><br></p>" and current_content != "<p>Start writing your story here...</p>":
+if _has_content(current_content):
     with st.expander("👁️ Preview your story", expanded=False):
         st.markdown("### 📖 Preview")
         st.markdown(current_content, unsafe_allow_html=True)
@@ -5700,7 +6377,7 @@ tab1, tab2 = st.tabs(["📝 Current Session", "📚 Feedback History"])
 
 with tab1:
     sdata = st.session_state.responses.get(current_session_id, {})
-    answered_cnt = len(sdata.get("questions", {}))
+    answered_cnt = get_answer_counts()[current_session_id]
     total_q = len(current_session["questions"])
 
     st.markdown(f"**Progress:** {answered_cnt}/{total_q} topics answered")
@@ -5717,11 +6394,9 @@ with tab1:
     with col2:
         if st.button("🦋 Get Beta Read", key=f"beta_btn_{beta_key}", use_container_width=True, type="primary"):
             with st.spinner("Beta Reader is analyzing your stories with full profile context..."):
-                if beta_reader:
-                    session_text = ""
-                    for q, a in sdata.get("questions", {}).items():
-                        text_only = re.sub(r'<[^>]+>', '', a.get("answer", ""))
-                        session_text += f"Question: {q}\nAnswer: {text_only}\n\n"
+                if get_beta_reader():
+                    session_text = "".join(f"Question: {q}\nAnswer: {answer_text(a)}\n\n"
+                                           for q, a in sdata.get("questions", {}).items())
                     
                     if session_text.strip():
                         fb = generate_beta_reader_feedback(current_session["title"], session_text, fb_type)
@@ -5768,7 +6443,7 @@ with tab2:
         
         for i, entry in enumerate(all_entries):
             fb = entry['feedback']
-            fb_date = datetime.fromisoformat(entry['date']).strftime('%B %d, %Y at %I:%M %p')
+            fb_date = format_feedback_date(entry['date'])
             
             with st.expander(f"📖 {entry['session_title']} - {fb_date} ({fb.get('feedback_type', 'comprehensive').title()})"):
                 col1, col2, col3 = st.columns([2, 2, 1])
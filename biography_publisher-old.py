@@ -632,10 +632,8 @@ def generate_pdf(title, author, stories, format_style="interview", include_toc=T
     try:
         from weasyprint import HTML
         
-        pdf_bytes = io.BytesIO()
-        HTML(string=html_content).write_pdf(pdf_bytes)
-        pdf_bytes.seek(0)
-        return pdf_bytes.getvalue(), None
+        # With no target, write_pdf returns the document bytes directly
+        return HTML(string=html_content).write_pdf(), None
         
     except ImportError:
         # Try pandoc as fallback
@@ -26,8 +26,12 @@ class ImageHandler:
     def get_user_path(self):
         """Get user-specific upload path"""
         if self.user_id:
-            user_hash = hashlib.md5(self.user_id.encode()).hexdigest()[:8]
+            user_hash = hashlib.blake2b(self.user_id.encode(), digest_size=4).hexdigest()
             path = f"{self.base_path}/user_{user_hash}"
+            legacy = f"{self.base_path}/user_{hashlib.md5(self.user_id.encode()).hexdigest()[:8]}"
+            if not os.path.exists(path) and os.path.exists(legacy):
+                # Folders created before the switch from md5 are moved over on first use
+                os.replace(legacy, path)
             os.makedirs(path, exist_ok=True)
             os.makedirs(f"{path}/thumbnails", exist_ok=True)
             return path
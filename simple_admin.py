@@ -1,7 +1,19 @@
 import streamlit as st
 import json
+import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
+import shutil
+import tempfile
+import html
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson else json.loads
 
 st.set_page_config(page_title="Simple User Admin", page_icon="👤")
 
@@ -30,40 +42,123 @@ if not accounts_dir.exists():
     st.error("No accounts folder found")
     st.stop()
 
-users = []
-for account_file in accounts_dir.glob("*_account.json"):
-    with open(account_file) as f:
-        account = json.load(f)
+index_file = accounts_dir / "accounts_index.json"
+
+def _user_entry(path, user_id, email, first_name, last_name, created_at, last_login):
+    name = f"{first_name or ''} {last_name or ''}"
+    created = (created_at or "unknown")[:10]
+    last_login = last_login[:10] if last_login else "never"
+    return {
+        "file": path,
+        "email": email or "unknown",
+        "name": name,
+        "_search_blob": f"{email or ''} {name}".lower(),
+        "_row_html": (
+            '<div style="display:flex;gap:1.5rem;align-items:center;">'
+            f'<span style="flex:2"><strong>{html.escape(email or "unknown")}</strong></span>'
+            f'<span style="flex:2">{html.escape(name)}</span>'
+            f'<span style="flex:1">📅 {html.escape(created)}</span>'
+            f'<span style="flex:1">🔑 {html.escape(last_login)}</span>'
+            '</div>'
+        ),
+        "created": created,
+        "last_login": last_login,
+        "id": user_id,
+        "data_file": f"user_data_{hashlib.blake2b(user_id.encode(), digest_size=4).hexdigest()}.json",
+        "legacy_data_file": f"user_data_{hashlib.md5(user_id.encode()).hexdigest()[:8]}.json",
+        "responses_dir": os.path.join("responses", hashlib.blake2b(user_id.encode(), digest_size=4).hexdigest())
+    }
+
+def _load_one(path):
+    try:
+        with open(path, 'rb') as f:
+            account = _loads(f.read())
+    except Exception:
+        return None
     
-    users.append({
-        "file": account_file,
-        "email": account.get("email", "unknown"),
-        "name": f"{account.get('profile', {}).get('first_name', '')} {account.get('profile', {}).get('last_name', '')}",
-        "created": account.get("created_at", "unknown")[:10],
-        "last_login": account.get("last_login", "never")[:10] if account.get("last_login") else "never",
-        "id": account.get("user_id", "")
-    })
-
-# Show users
-for user in users:
-    col1, col2, col3, col4, col5 = st.columns([2, 2, 1, 1, 1])
+    profile = account.get("profile", {})
+    return _user_entry(path, account.get("user_id", ""), account.get("email"),
+                       profile.get("first_name"), profile.get("last_name"),
+                       account.get("created_at"), account.get("last_login"))
+
+def _load_from_index():
+    with open(index_file, 'rb') as f:
+        index = _loads(f.read())
+    
+    users = []
+    for user_id, info in index.items():
+        path = os.path.join(accounts_dir, f"{user_id}_account.json")
+        if "last_login" not in info:
+            # Entries written before the index tracked logins
+            user = _load_one(path)
+        else:
+            user = _user_entry(path, user_id, info.get("email"), info.get("first_name"),
+                               info.get("last_name"), info.get("created_at"), info.get("last_login"))
+        if user:
+            users.append(user)
+    return users
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_all_users():
+    if index_file.exists():
+        try:
+            users = _load_from_index()
+            users.sort(key=lambda u: u["created"])
+            return users
+        except Exception:
+            pass
+    
+    with os.scandir(accounts_dir) as it:
+        paths = [entry.path for entry in it
+                 if entry.name.endswith("_account.json") and entry.is_file(follow_symlinks=False)]
+    
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        users = [u for u in ex.map(_load_one, paths) if u]
+    users.sort(key=lambda u: u["created"])
+    return users
+
+def remove_from_index(user_id):
+    if not index_file.exists():
+        return
+    with open(index_file, 'rb') as f:
+        index = _loads(f.read())
+    if index.pop(user_id, None) is not None:
+        # Unique temp name so this never collides with the main app rewriting the index
+        fd, tmp_file = tempfile.mkstemp(dir=index_file.parent, suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            json.dump(index, f, separators=(',', ':'))
+        os.replace(tmp_file, index_file)
+
+users = load_all_users()
+
+PAGE_SIZE = 50
+
+search = st.text_input("🔍 Search", placeholder="Email or name").strip().lower()
+matches = [u for u in users if search in u['_search_blob']] if search else users
+page_count = max(1, (len(matches) + PAGE_SIZE - 1) // PAGE_SIZE)
+# Keyed on the search so a new filter starts back at page 1
+page_num = st.number_input("Page", min_value=1, max_value=page_count, value=1, key=f"page_{search}") if page_count > 1 else 1
+page_num = min(int(page_num), page_count)
+
+# Show users (one page at a time)
+for user in matches[(page_num - 1) * PAGE_SIZE:page_num * PAGE_SIZE]:
+    col1, col2 = st.columns([6, 1])
     with col1:
-        st.write(f"**{user['email']}**")
+        st.markdown(user['_row_html'], unsafe_allow_html=True)
     with col2:
-        st.write(user['name'])
-    with col3:
-        st.write(f"📅 {user['created']}")
-    with col4:
-        st.write(f"🔑 {user['last_login']}")
-    with col5:
         if st.button("🗑️ Delete", key=user['id']):
             # Delete account file
-            user['file'].unlink()
-            # Also delete their data file
-            data_file = Path(f"user_data_{hashlib.md5(user['id'].encode()).hexdigest()[:8]}.json")
-            if data_file.exists():
-                data_file.unlink()
+            if os.path.exists(user['file']):
+                os.remove(user['file'])
+            remove_from_index(user['id'])
+            # Also delete their data file (either naming scheme)
+            for name in (user['data_file'], user['legacy_data_file']):
+                data_file = Path(name)
+                if data_file.exists():
+                    data_file.unlink()
+            shutil.rmtree(user['responses_dir'], ignore_errors=True)
             st.success(f"Deleted {user['email']}")
+            load_all_users.clear()
             st.rerun()
     st.divider()
 
@@ -12,9 +12,17 @@ import openai
 
 from streamlit_quill import st_quill
 
+_TAG_RE = re.compile(r'<[^>]+>')
+_MD_HEADING_RE = re.compile(r'#{1,6}\s*')
+_MD_LINK_RE = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+
 class VignetteManager:
-    def __init__(self, user_id):
+    def __init__(self, user_id, client=None):
         self.user_id = user_id
+        # The app passes in its pooled client; standalone use falls back to a fresh one per call
+        self.client = client
         self.file = f"user_vignettes/{user_id}_vignettes.json"
         os.makedirs("user_vignettes", exist_ok=True)
         os.makedirs(f"user_vignettes/{user_id}_images", exist_ok=True)
@@ -71,7 +79,7 @@ class VignetteManager:
             "content": content,
             "theme": theme,
             "mood": mood,
-            "word_count": len(re.sub(r'<[^>]+>', '', content).split()),
+            "word_count": len(_TAG_RE.sub('', content).split()),
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat(),
             "is_draft": is_draft,
@@ -90,7 +98,7 @@ class VignetteManager:
             "content": content,
             "theme": theme,
             "mood": mood,
-            "word_count": len(re.sub(r'<[^>]+>', '', content).split()),
+            "word_count": len(_TAG_RE.sub('', content).split()),
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat(),
             "is_draft": is_draft,
@@ -109,7 +117,7 @@ class VignetteManager:
                     "content": content, 
                     "theme": theme, 
                     "mood": mood or v.get("mood", "Reflective"),
-                    "word_count": len(re.sub(r'<[^>]+>', '', content).split()), 
+                    "word_count": len(_TAG_RE.sub('', content).split()), 
                     "updated_at": datetime.now().isoformat(),
                     "images": images or v.get("images", [])
                 })
@@ -128,12 +136,15 @@ class VignetteManager:
                 return v
         return None
     
+    def _get_client(self):
+        return self.client or openai.OpenAI(api_key=st.secrets.get("OPENAI_API_KEY", os.environ.get("OPENAI_API_KEY")))
+    
     def check_spelling(self, text):
         """Check spelling and grammar using OpenAI"""
         if not text: 
             return text
         try:
-            client = openai.OpenAI(api_key=st.secrets.get("OPENAI_API_KEY", os.environ.get("OPENAI_API_KEY")))
+            client = self._get_client()
             resp = client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
@@ -151,9 +162,9 @@ class VignetteManager:
     def ai_rewrite_vignette(self, original_text, person_option, vignette_title):
         """Rewrite the vignette in 1st, 2nd, or 3rd person using profile context"""
         try:
-            client = openai.OpenAI(api_key=st.secrets.get("OPENAI_API_KEY", os.environ.get("OPENAI_API_KEY")))
+            client = self._get_client()
             
-            clean_text = re.sub(r'<[^>]+>', '', original_text)
+            clean_text = _TAG_RE.sub('', original_text)
             
             if len(clean_text.split()) < 5:
                 return {"error": "Text too short to rewrite (minimum 5 words)"}
@@ -249,8 +260,8 @@ class VignetteManager:
             
             elif file_extension == 'md':
                 file_content = uploaded_file.read().decode('utf-8', errors='ignore')
-                file_content = re.sub(r'#{1,6}\s*', '', file_content)
-                file_content = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', file_content)
+                file_content = _MD_HEADING_RE.sub('', file_content)
+                file_content = _MD_LINK_RE.sub(r'\1', file_content)
             
             else:
                 st.error(f"Unsupported format: .{file_extension}")
@@ -262,8 +273,8 @@ class VignetteManager:
                 return None
             
             # Clean and format
-            file_content = re.sub(r'\s+', ' ', file_content)
-            sentences = re.split(r'[.!?]+', file_content)
+            file_content = _WHITESPACE_RE.sub(' ', file_content)
+            sentences = _SENTENCE_END_RE.split(file_content)
             paragraphs = []
             current_para = []
             
@@ -421,7 +432,7 @@ class VignetteManager:
             if has_content and not showing_results:
                 if st.button("🔍 Spell Check", key=f"{base_key}_spell", use_container_width=True):
                     with st.spinner("Checking spelling and grammar..."):
-                        text_only = re.sub(r'<[^>]+>', '', current_content)
+                        text_only = _TAG_RE.sub('', current_content)
                         if len(text_only.split()) >= 3:
                             corrected = self.check_spelling(text_only)
                             if corrected and corrected != text_only:
@@ -672,7 +683,7 @@ class VignetteManager:
                     st.markdown(f"### {status_emoji} {v['title']}  `{status_text}`")
                     st.markdown(f"*{v['theme']}*")
                     
-                    content_preview = re.sub(r'<[^>]+>', '', v['content'])
+                    content_preview = _TAG_RE.sub('', v['content'])
                     if len(content_preview) > 100:
                         content_preview = content_preview[:100] + "..."
                     st.markdown(content_preview)